@@ -1,62 +1,94 @@
 """Authentication utilities for JWT tokens and password hashing."""
 
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
+import bcrypt
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import lambda_stmt, select, update
+from sqlalchemy.orm import Session, load_only
 from dotenv import load_dotenv
 
-from backend.data_pipeline.models import User, DatabaseManager
+from backend.data_pipeline.models import User
+from backend.api.cache import TTLCache
+from backend.api.database import db_manager
 
 # Load environment variables
 load_dotenv()
 
 # Security settings
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production-use-env-variable")
-ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")  # HMAC via the cryptography (OpenSSL) backend of python-jose
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "480"))  # 8 hours (max session)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Decoded JWT payloads keyed by token hash, so repeated requests skip signature
+# verification. Kept short so expiry is never extended by more than a few seconds.
+TOKEN_CACHE_TTL_SECONDS = 30
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+# Minimal user rows keyed by username, so deactivated or deleted accounts lose
+# access within a minute without a DB round-trip on every request.
+USER_CACHE_TTL_SECONDS = 60
+_user_cache = TTLCache(maxsize=5000, ttl=USER_CACHE_TTL_SECONDS)
+
+# Password hashing via the bcrypt C bindings (hashes created earlier through passlib
+# share the $2b$ format). Default cost is 12; calibrate per host with
+# ops/calibrate_bcrypt.py (a Raspberry Pi typically needs a lower value).
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Warm the bcrypt extension at import (minimum cost, ~1ms) so the first login
+# after a deploy does not pay for it
+bcrypt.hashpw(b"warmup", bcrypt.gensalt(rounds=4))
 
 # Bearer token scheme
 security = HTTPBearer()
 
-# Database manager
-db_manager = DatabaseManager()
-
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """
+    Verify a plain password against a hashed password.
+
+    bcrypt.checkpw re-hashes and compares in constant time; do not add an
+    equality fast path here, it would leak timing information.
+    """
+    try:
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Malformed or non-bcrypt hash stored for this user
+        return False
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+        lifetime = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    # exp as an integer epoch, which is what the JWT claim holds anyway
+    to_encode.update({"exp": int(time.time()) + lifetime})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_token(token: str) -> dict:
-    """Decode and verify a JWT token."""
+    """Decode and verify a JWT token (cached briefly per token)."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,6 +96,45 @@ def decode_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Never keep a payload cached past its own expiry
+    exp = payload.get("exp")
+    if exp is not None:
+        _token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
+
+def get_cached_user(username: str) -> Optional[dict]:
+    """Look up {id, username, is_admin, is_active} for a user, cached briefly."""
+    user_data = _user_cache.get(username)
+    if user_data is not None:
+        return user_data
+
+    session = db_manager.get_session()
+    try:
+        # lambda_stmt caches the compiled SQL; username becomes a bound parameter
+        user = session.execute(lambda_stmt(
+            lambda: select(User.id, User.username, User.is_admin, User.is_active)
+            .where(User.username == username)
+        )).first()
+        if not user:
+            return None
+        user_data = {
+            "id": user.id,
+            "username": user.username,
+            "is_admin": user.is_admin,
+            "is_active": user.is_active,
+        }
+    finally:
+        session.close()
+
+    _user_cache.set(username, user_data)
+    return user_data
+
+
+def invalidate_user_cache(username: str) -> None:
+    """Drop a cached user row. Call after changing or deleting a user."""
+    _user_cache.pop(username, None)
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -84,10 +155,17 @@ def get_current_user(
             detail="Could not validate credentials",
         )
 
+    user = get_cached_user(username)
+    if not user or not user["is_active"] or user["id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+
     return {
-        "id": user_id,
-        "username": username,
-        "is_admin": payload.get("is_admin", False)
+        "id": user["id"],
+        "username": user["username"],
+        "is_admin": user["is_admin"],
     }
 
 
@@ -105,22 +183,29 @@ def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict:
 
 
 def authenticate_user(username: str, password: str) -> Optional[dict]:
-    """Authenticate a user by username and password. Returns user data dict."""
+    """
+    Authenticate a user by username and password. Returns user data dict.
+    The last_login stamp is left to record_login, so callers can defer it.
+    """
     session = db_manager.get_session()
     try:
-        user = session.query(User).filter(User.username == username).first()
+        user = session.query(User).options(
+            load_only(
+                User.id,
+                User.username,
+                User.full_name,
+                User.is_admin,
+                User.is_active,
+                User.hashed_password,
+            )
+        ).filter(User.username == username).first()
         if not user:
             return None
         if not user.is_active:
             return None
-        if not verify_password(password, user.hashed_password):
-            return None
-
-        # Update last login
-        user.last_login = datetime.utcnow()
-        session.commit()
 
         # Extract data before closing session
+        hashed_password = user.hashed_password
         user_data = {
             "id": user.id,
             "username": user.username,
@@ -128,7 +213,23 @@ def authenticate_user(username: str, password: str) -> Optional[dict]:
             "is_admin": user.is_admin,
             "is_active": user.is_active,
         }
+    finally:
+        # Release the connection before the (slow) bcrypt check
+        session.close()
 
-        return user_data
+    if not verify_password(password, hashed_password):
+        return None
+
+    return user_data
+
+
+def record_login(user_id: int) -> None:
+    """Stamp a user's last_login with a single UPDATE (run as a background task)."""
+    session = db_manager.get_session()
+    try:
+        session.execute(
+            update(User).where(User.id == user_id).values(last_login=datetime.utcnow())
+        )
+        session.commit()
     finally:
         session.close()
@@ -3,6 +3,8 @@ Application constants.
 Extracted from main.py for better organization.
 """
 
+import os
+
 # Fixed cost calculation now uses sub_type='Essentials' instead of category names
 # This constant is kept for backward compatibility but is no longer actively used
 FIXED_COST_CATEGORIES = ["Housing", "Health Insurance"]  # Legacy - use sub_type='Essentials' instead
@@ -11,9 +13,14 @@ FIXED_COST_CATEGORIES = ["Housing", "Health Insurance"]  # Legacy - use sub_type
 DEFAULT_PAGE_SIZE = 500
 MAX_PAGE_SIZE = 1000
 
-# CORS allowed origins (can be overridden by environment variables)
+# CORS allowed origins, extended by CORS_EXTRA_ORIGINS (comma-separated)
 CORS_ORIGINS = [
     "http://localhost:5173",
     "http://localhost:3000",
-    "http://localhost:8080",
-]
+    "https://lucid-finance.cc",
+    "http://lucid-pi.local",
+] + [origin.strip() for origin in os.getenv("CORS_EXTRA_ORIGINS", "").split(",") if origin.strip()]
+
+# Explicit CORS methods/headers (wildcards make Starlette echo request headers per preflight)
+CORS_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+CORS_HEADERS = ["Authorization", "Content-Type"]
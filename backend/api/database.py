@@ -0,0 +1,11 @@
+"""
+Shared database manager for the API.
+One DatabaseManager (and therefore one engine and connection pool) per process;
+import db_manager from here rather than constructing another.
+"""
+
+from ..data_pipeline.models import DatabaseManager
+from ..data_pipeline.config import DatabaseConfig
+
+db_config = DatabaseConfig()
+db_manager = DatabaseManager(db_config)
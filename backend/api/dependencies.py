@@ -7,19 +7,16 @@ Authentication dependencies are imported from auth module.
 from typing import Generator
 from sqlalchemy.orm import Session
 
-from ..data_pipeline.models import DatabaseManager
-from ..data_pipeline.config import DatabaseConfig
+from .database import db_config, db_manager
 from .auth import get_current_user, get_admin_user
 
-# Initialize database manager (singleton)
-db_config = DatabaseConfig()
-db_manager = DatabaseManager(db_config)
-
 
 def get_db() -> Generator[Session, None, None]:
     """
     FastAPI dependency that provides a database session.
     Automatically handles commit/rollback and closing the session.
+    Objects are not expired on commit, so handlers can return them without
+    a refresh round-trip (Python-side defaults are already populated).
 
     Usage:
         @router.get("/endpoint")
@@ -27,7 +24,7 @@ def get_db() -> Generator[Session, None, None]:
             # Use session here
             pass
     """
-    session = db_manager.get_session()
+    session = db_manager.get_session(expire_on_commit=False)
     try:
         yield session
         session.commit()
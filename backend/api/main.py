@@ -7,14 +7,18 @@ Provides REST API endpoints for:
 - Dashboard summaries
 """
 
+import time
 from datetime import datetime
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
+from .constants import CORS_ORIGINS, CORS_METHODS, CORS_HEADERS
 from .dependencies import get_db, get_current_user
+from ..data_pipeline.config import PipelineConfig
 from .routers import (
     auth_router,
     transactions_router,
@@ -24,28 +28,28 @@ from .routers import (
     dashboard_router,
     export_router,
 )
+from .routers.transactions import get_available_years as load_available_years
 
 load_dotenv()
 
+# Valid transaction types are fixed for the lifetime of the process
+VALID_TYPES = PipelineConfig().categories.valid_types
+
 # Initialize app
 app = FastAPI(
     title="LUCID Finance API",
     description="Personal budgeting application API",
     version="0.1.0",
+    default_response_class=ORJSONResponse,  # orjson (C/Rust) instead of stdlib json
 )
 
 # CORS middleware for React frontend
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",
-        "http://localhost:3000",
-        "https://lucid-finance.cc",
-        "http://lucid-pi.local",
-    ],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=CORS_METHODS,
+    allow_headers=CORS_HEADERS,
 )
 
 # Include routers
@@ -58,19 +62,31 @@ app.include_router(dashboard_router)
 app.include_router(export_router)
 
 
+# Health check body, rebuilt at most once per second for frequent probes
+_health_body = (0, b"")
+
+
+def _current_health_body() -> bytes:
+    """Return the pre-encoded health JSON with a second-resolution timestamp."""
+    global _health_body
+    now = int(time.time())
+    if _health_body[0] != now:
+        timestamp = datetime.fromtimestamp(now).isoformat()
+        _health_body = (now, b'{"status":"healthy","timestamp":"%s"}' % timestamp.encode())
+    return _health_body[1]
+
+
 # Health check
-@app.get("/api/health")
-def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+@app.get("/api/health", response_class=Response)
+async def health_check():
+    """Health check endpoint (async and pre-encoded: no threadpool hop, no JSON encoder)."""
+    return Response(content=_current_health_body(), media_type="application/json")
 
 
 @app.get("/api/types")
 def get_types():
     """Get all valid transaction types."""
-    from ..data_pipeline.config import PipelineConfig
-    pipeline_config = PipelineConfig()
-    return pipeline_config.categories.valid_types
+    return VALID_TYPES
 
 
 @app.get("/api/years")
@@ -79,11 +95,7 @@ def get_available_years(
     session: Session = Depends(get_db)
 ):
     """Get list of years with transaction data."""
-    from ..data_pipeline.models import Transaction
-    years = session.query(Transaction.year).filter(
-        Transaction.user_id == current_user["id"]
-    ).distinct().order_by(Transaction.year.desc()).all()
-    return [y[0] for y in years]
+    return load_available_years(session, current_user["id"])
 
 
 if __name__ == "__main__":
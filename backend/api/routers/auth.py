@@ -3,20 +3,31 @@ Authentication endpoints for user management and login.
 """
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from ..auth import authenticate_user, create_access_token, get_password_hash
+from ..auth import (
+    authenticate_user,
+    create_access_token,
+    get_password_hash,
+    invalidate_user_cache,
+    record_login,
+)
 from ..dependencies import get_db, get_current_user, get_admin_user
-from ..schemas import LoginRequest, LoginResponse, UserCreate, UserResponse
+from ..schemas import LoginRequest, LoginResponse, UserCreate, UserResponse, UserListAdapter
 from ...data_pipeline.models import User
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(credentials: LoginRequest):
+def login(credentials: LoginRequest, background_tasks: BackgroundTasks):
     """Authenticate user and return JWT token."""
+    # Deliberately a sync endpoint: FastAPI runs it in the threadpool, so the
+    # bcrypt check never blocks the event loop. Offload it explicitly if this
+    # is ever turned into an async def.
     user = authenticate_user(credentials.username, credentials.password)
     if not user:
         raise HTTPException(
@@ -24,6 +35,9 @@ def login(credentials: LoginRequest):
             detail="Incorrect username or password"
         )
 
+    # last_login is not needed for the response; write it after replying
+    background_tasks.add_task(record_login, user["id"])
+
     access_token = create_access_token(
         data={"sub": user["username"], "user_id": user["id"], "is_admin": user["is_admin"]}
     )
@@ -43,22 +57,25 @@ def create_user(
     session: Session = Depends(get_db)
 ):
     """Create a new user (admin only)."""
-    # Check if username already exists
-    existing = session.query(User).filter(User.username == user_data.username).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Username already exists")
+    # Hash before the insert: the session only checks out a DB connection
+    # on first use, so no pooled connection sits idle during bcrypt. Like login,
+    # this stays a sync endpoint so the hash runs in the threadpool.
+    hashed_password = get_password_hash(user_data.password)
 
-    # Create new user
+    # Create new user; the unique username constraint rejects duplicates
     new_user = User(
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
         full_name=user_data.full_name,
         is_admin=user_data.is_admin,
         is_active=True
     )
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(status_code=400, detail="Username already exists")
 
     return UserResponse.model_validate(new_user)
 
@@ -69,8 +86,10 @@ def list_users(
     session: Session = Depends(get_db)
 ):
     """List all users (admin only)."""
-    users = session.query(User).all()
-    return [UserResponse.model_validate(u) for u in users]
+    users = session.execute(
+        select(*(getattr(User, field) for field in UserResponse.model_fields))
+    ).mappings().all()
+    return UserListAdapter.validate_python(users)
 
 
 @router.get("/me")
@@ -126,6 +145,7 @@ def delete_user(
     # Delete the user
     session.delete(user)
     session.commit()
+    invalidate_user_cache(user.username)
 
     return {
         "message": f"User '{user.username}' deleted successfully",
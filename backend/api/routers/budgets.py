@@ -2,18 +2,67 @@
 Budget planning endpoints for creating and managing budgets.
 """
 
-from typing import List, Optional
-from decimal import Decimal
+from typing import Dict, List, Optional
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from ..dependencies import get_db, get_current_user
-from ..schemas import BudgetPlanResponse, BudgetPlanCreate
+from .dashboard import invalidate_dashboard_cache
+from ..schemas import BudgetPlanResponse, BudgetPlanListAdapter, BudgetPlanCreate
 from ...data_pipeline.models import BudgetPlan
 
 router = APIRouter(prefix="/api/budgets", tags=["Budgets"])
 
+# Budget amounts are stored as Numeric(12, 2)
+CENT = Decimal("0.01")
+
+
+def to_cents(value) -> Decimal:
+    """
+    Round an amount to cents the way MySQL stores it in a DECIMAL column.
+
+    Floats go through str() so 2.675 is the 2.675 the user typed, not its binary
+    expansion (2.67499...), and halves round away from zero as MySQL does.
+    """
+    return Decimal(str(value)).quantize(CENT, ROUND_HALF_UP)
+
+
+def upsert_monthly_budgets(
+    session: Session,
+    user_id: int,
+    budget: BudgetPlanCreate,
+    amounts: Dict[int, Decimal],
+) -> None:
+    """
+    Create or update the given months of a budget in one round-trip.
+
+    Uses MySQL's INSERT ... ON DUPLICATE KEY UPDATE against uq_user_budget_plan.
+    Only for monthly rows: yearly rows have month=NULL and never hit the key.
+    """
+    stmt = mysql_insert(BudgetPlan).values([
+        {
+            "user_id": user_id,
+            "type": budget.type,
+            "category": budget.category,
+            "sub_type": budget.sub_type,
+            "year": budget.year,
+            "month": month_num,
+            "amount": amount,
+        }
+        for month_num, amount in amounts.items()
+    ])
+    stmt = stmt.on_duplicate_key_update(
+        amount=stmt.inserted.amount,
+        sub_type=stmt.inserted.sub_type,
+        updated_at=datetime.utcnow(),
+    )
+    session.execute(stmt)
+
 
 @router.get("", response_model=List[BudgetPlanResponse])
 def get_budgets(
@@ -22,11 +71,13 @@ def get_budgets(
     session: Session = Depends(get_db)
 ):
     """Get all budget plans, optionally filtered by year."""
-    query = session.query(BudgetPlan).filter(BudgetPlan.user_id == current_user["id"])
+    query = select(
+        *(getattr(BudgetPlan, field) for field in BudgetPlanResponse.model_fields)
+    ).where(BudgetPlan.user_id == current_user["id"])
     if year:
-        query = query.filter(BudgetPlan.year == year)
-    budgets = query.all()
-    return [BudgetPlanResponse.model_validate(b) for b in budgets]
+        query = query.where(BudgetPlan.year == year)
+    budgets = session.execute(query).mappings().all()
+    return BudgetPlanListAdapter.validate_python(budgets)
 
 
 @router.post("", response_model=BudgetPlanResponse)
@@ -37,6 +88,8 @@ def create_budget(
     session: Session = Depends(get_db)
 ):
     """Create or update a budget plan with optional auto-population."""
+    amount = to_cents(budget.amount)
+
     # Check if budget already exists for current user
     existing = session.query(BudgetPlan).filter(
         BudgetPlan.user_id == current_user["id"],
@@ -47,7 +100,7 @@ def create_budget(
     ).first()
 
     if existing:
-        existing.amount = Decimal(str(budget.amount))
+        existing.amount = amount
         existing.sub_type = budget.sub_type
     else:
         existing = BudgetPlan(
@@ -57,7 +110,7 @@ def create_budget(
             sub_type=budget.sub_type,
             year=budget.year,
             month=budget.month,
-            amount=Decimal(str(budget.amount)),
+            amount=amount,
         )
         session.add(existing)
 
@@ -76,85 +129,56 @@ def create_budget(
             BudgetPlan.month == budget.month,
         ).first()
         if existing:
-            existing.amount = Decimal(str(budget.amount))
+            existing.amount = amount
             existing.sub_type = budget.sub_type
             session.commit()
         else:
             raise  # Re-raise if we still can't find it
 
-    session.refresh(existing)
-
     # Auto-populate monthly budgets from yearly (or vice versa)
     if auto_populate:
         if budget.month is None:
-            # Yearly budget entered → create/update 12 monthly budgets
-            monthly_amount = Decimal(str(budget.amount)) / 12
-            for month_num in range(1, 13):
-                monthly_budget = session.query(BudgetPlan).filter(
-                    BudgetPlan.user_id == current_user["id"],
-                    BudgetPlan.type == budget.type,
-                    BudgetPlan.category == budget.category,
-                    BudgetPlan.year == budget.year,
-                    BudgetPlan.month == month_num,
-                ).first()
-
-                if monthly_budget:
-                    monthly_budget.amount = monthly_amount
-                    monthly_budget.sub_type = budget.sub_type
-                else:
-                    monthly_budget = BudgetPlan(
-                        user_id=current_user["id"],
-                        type=budget.type,
-                        category=budget.category,
-                        sub_type=budget.sub_type,
-                        year=budget.year,
-                        month=month_num,
-                        amount=monthly_amount,
-                    )
-                    session.add(monthly_budget)
-                # Flush after each addition to prevent autoflush conflicts in subsequent queries
-                try:
-                    session.flush()
-                except IntegrityError:
-                    # Budget already exists, rollback and update instead
-                    session.rollback()
-                    monthly_budget = session.query(BudgetPlan).filter(
-                        BudgetPlan.user_id == current_user["id"],
-                        BudgetPlan.type == budget.type,
-                        BudgetPlan.category == budget.category,
-                        BudgetPlan.year == budget.year,
-                        BudgetPlan.month == month_num,
-                    ).first()
-                    if monthly_budget:
-                        monthly_budget.amount = monthly_amount
-                        monthly_budget.sub_type = budget.sub_type
-                        session.flush()
+            # Yearly budget entered → create/update 12 monthly budgets in one statement
+            monthly_amount = to_cents(amount / 12)
+            upsert_monthly_budgets(
+                session,
+                current_user["id"],
+                budget,
+                {month_num: monthly_amount for month_num in range(1, 13)},
+            )
         else:
             # Monthly budget entered → update yearly budget (sum all months)
-            all_monthly = session.query(BudgetPlan).filter(
+            month_count, yearly_total = session.query(
+                func.count(BudgetPlan.id),
+                func.sum(BudgetPlan.amount),
+            ).filter(
                 BudgetPlan.user_id == current_user["id"],
                 BudgetPlan.type == budget.type,
                 BudgetPlan.category == budget.category,
                 BudgetPlan.year == budget.year,
                 BudgetPlan.month.isnot(None),
-            ).all()
-
-            if len(all_monthly) == 12:
-                # All 12 months exist, calculate yearly total
-                yearly_total = sum(Decimal(str(b.amount)) for b in all_monthly)
-                yearly_budget = session.query(BudgetPlan).filter(
-                    BudgetPlan.user_id == current_user["id"],
-                    BudgetPlan.type == budget.type,
-                    BudgetPlan.category == budget.category,
-                    BudgetPlan.year == budget.year,
-                    BudgetPlan.month.is_(None),
-                ).first()
-
-                if yearly_budget:
-                    yearly_budget.amount = yearly_total
-                    yearly_budget.sub_type = budget.sub_type
-                else:
-                    yearly_budget = BudgetPlan(
+            ).one()
+
+            if month_count == 12:
+                # All 12 months exist, store their total as the yearly budget:
+                # update it in place, without loading it first
+                updated = session.execute(
+                    update(BudgetPlan)
+                    .where(
+                        BudgetPlan.user_id == current_user["id"],
+                        BudgetPlan.type == budget.type,
+                        BudgetPlan.category == budget.category,
+                        BudgetPlan.year == budget.year,
+                        BudgetPlan.month.is_(None),
+                    )
+                    .values(amount=yearly_total, sub_type=budget.sub_type)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+
+                if not updated:
+                    # Yearly rows have month=NULL, which the unique constraint never
+                    # matches, so there is no duplicate-key race to handle here
+                    session.add(BudgetPlan(
                         user_id=current_user["id"],
                         type=budget.type,
                         category=budget.category,
@@ -162,27 +186,11 @@ def create_budget(
                         year=budget.year,
                         month=None,
                         amount=yearly_total,
-                    )
-                    session.add(yearly_budget)
-                try:
-                    session.flush()
-                except IntegrityError:
-                    # Budget already exists, rollback and update instead
-                    session.rollback()
-                    yearly_budget = session.query(BudgetPlan).filter(
-                        BudgetPlan.user_id == current_user["id"],
-                        BudgetPlan.type == budget.type,
-                        BudgetPlan.category == budget.category,
-                        BudgetPlan.year == budget.year,
-                        BudgetPlan.month.is_(None),
-                    ).first()
-                    if yearly_budget:
-                        yearly_budget.amount = yearly_total
-                        yearly_budget.sub_type = budget.sub_type
-                        session.flush()
+                    ))
 
         session.commit()
 
+    invalidate_dashboard_cache(current_user["id"])
     return BudgetPlanResponse.model_validate(existing)
 
 
@@ -202,6 +210,7 @@ def delete_budget(
 
     session.delete(budget)
     session.commit()
+    invalidate_dashboard_cache(current_user["id"])
     return {"message": "Budget deleted"}
 
 
@@ -218,4 +227,5 @@ def bulk_delete_budgets(
     ).delete(synchronize_session=False)
 
     session.commit()
+    invalidate_dashboard_cache(current_user["id"])
     return {"message": f"Deleted {deleted_count} budget(s)", "count": deleted_count}
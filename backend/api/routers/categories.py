@@ -3,12 +3,21 @@ Category management endpoints for transaction categorization.
 """
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.exc import IntegrityError
 
+from ..cache import TTLCache
 from ..dependencies import get_db, get_current_user, db_manager
-from ..schemas import CategoryInfo, CategoryResponse, CategoryCreate, CategoryUpdate
+from ..schemas import (
+    CategoryInfo,
+    CategoryInfoListAdapter,
+    CategoryResponse,
+    CategoryListAdapter,
+    CategoryCreate,
+    CategoryUpdate,
+)
 from ...data_pipeline.models import Category, Transaction, BudgetPlan
 from ...data_pipeline.config import PipelineConfig
 
@@ -17,47 +26,78 @@ router = APIRouter(prefix="/api/categories", tags=["Categories"])
 # Pipeline config for defaults
 pipeline_config = PipelineConfig()
 
+# Grouped categories served to users who have none of their own; only ever serialized
+DEFAULT_CATEGORY_INFO = [
+    CategoryInfo(type="Income", categories=pipeline_config.categories.income_categories),
+    CategoryInfo(type="Expenses", categories=pipeline_config.categories.expense_categories),
+    CategoryInfo(type="Savings", categories=pipeline_config.categories.savings_categories),
+]
 
-@router.get("", response_model=List[CategoryInfo])
-def get_categories(
-    current_user: dict = Depends(get_current_user),
-    session: Session = Depends(get_db)
-):
-    """Get all available categories grouped by type."""
-    # Get categories from database for current user
-    categories_db = session.query(Category).filter(
-        Category.user_id == current_user["id"],
-        Category.is_active.is_(True)
-    ).order_by(Category.display_order, Category.name).all()
+# Serialized JSON bodies of the read endpoints, keyed by (user_id, endpoint)
+CATEGORIES_CACHE_TTL_SECONDS = 60
+_categories_cache = TTLCache(maxsize=1024, ttl=CATEGORIES_CACHE_TTL_SECONDS)
+
+
+def invalidate_categories_cache(user_id: int) -> None:
+    """Drop a user's cached category responses after a write."""
+    for endpoint in ("grouped", "all"):
+        _categories_cache.pop((user_id, endpoint))
+
+
+def load_grouped_categories(session: Session, user_id: int) -> List[CategoryInfo]:
+    """Load a user's active categories grouped by type, falling back to config defaults."""
+    categories_db = session.execute(
+        select(Category.type, Category.name).where(
+            Category.user_id == user_id,
+            Category.is_active.is_(True)
+        ).order_by(Category.display_order, Category.name)
+    ).all()
 
     # If no categories in DB, use config defaults
     if not categories_db:
-        return [
-            CategoryInfo(type="Income", categories=pipeline_config.categories.income_categories),
-            CategoryInfo(type="Expenses", categories=pipeline_config.categories.expense_categories),
-            CategoryInfo(type="Savings", categories=pipeline_config.categories.savings_categories),
-        ]
+        return DEFAULT_CATEGORY_INFO
 
     # Group by type
     grouped = {}
-    for cat in categories_db:
-        if cat.type not in grouped:
-            grouped[cat.type] = []
-        grouped[cat.type].append(cat.name)
+    for cat_type, name in categories_db:
+        if cat_type not in grouped:
+            grouped[cat_type] = []
+        grouped[cat_type].append(name)
 
     return [CategoryInfo(type=t, categories=cats) for t, cats in grouped.items()]
 
 
+@router.get("", response_model=List[CategoryInfo])
+def get_categories(
+    current_user: dict = Depends(get_current_user),
+    session: Session = Depends(get_db)
+):
+    """Get all available categories grouped by type."""
+    cache_key = (current_user["id"], "grouped")
+    body = _categories_cache.get(cache_key)
+    if body is None:
+        body = CategoryInfoListAdapter.dump_json(load_grouped_categories(session, current_user["id"]))
+        _categories_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/all", response_model=List[CategoryResponse])
 def get_all_categories(
     current_user: dict = Depends(get_current_user),
     session: Session = Depends(get_db)
 ):
     """Get all categories (including inactive) for management."""
-    categories = session.query(Category).filter(
-        Category.user_id == current_user["id"]
-    ).order_by(Category.type, Category.display_order, Category.name).all()
-    return [CategoryResponse.model_validate(cat) for cat in categories]
+    cache_key = (current_user["id"], "all")
+    body = _categories_cache.get(cache_key)
+    if body is None:
+        categories = session.execute(
+            select(*(getattr(Category, field) for field in CategoryResponse.model_fields))
+            .where(Category.user_id == current_user["id"])
+            .order_by(Category.type, Category.display_order, Category.name)
+        ).mappings().all()
+        body = CategoryListAdapter.dump_json(CategoryListAdapter.validate_python(categories))
+        _categories_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("", response_model=CategoryResponse, status_code=201)
@@ -67,20 +107,8 @@ def create_category(
     session: Session = Depends(get_db)
 ):
     """Create a new category."""
-    # Check if category already exists for this user
-    existing = session.query(Category).filter(
-        Category.user_id == current_user["id"],
-        Category.name == category.name,
-        Category.type == category.type
-    ).first()
-
-    if existing:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Category '{category.name}' already exists for type '{category.type}'"
-        )
-
-    # Create new category
+    # Create new category; uq_user_active_category_name rejects a name already
+    # used by one of this user's active categories (archived names can be reused)
     new_category = Category(
         user_id=current_user["id"],
         name=category.name,
@@ -90,8 +118,15 @@ def create_category(
     )
 
     session.add(new_category)
-    session.commit()
-    session.refresh(new_category)
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Category '{category.name}' already exists for type '{category.type}'"
+        )
+    invalidate_categories_cache(current_user["id"])
 
     return CategoryResponse.model_validate(new_category)
 
@@ -114,20 +149,6 @@ def update_category(
 
     # Update fields
     if update.name is not None:
-        # Check for duplicate name within user's categories
-        existing = session.query(Category).filter(
-            Category.user_id == current_user["id"],
-            Category.name == update.name,
-            Category.type == (update.type if update.type else category.type),
-            Category.id != category_id
-        ).first()
-
-        if existing:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Category '{update.name}' already exists"
-            )
-
         category.name = update.name
 
     if update.type is not None:
@@ -139,8 +160,18 @@ def update_category(
     if update.display_order is not None:
         category.display_order = update.display_order
 
-    session.commit()
-    session.refresh(category)
+    # uq_user_active_category_name rejects renaming (or reactivating) onto the
+    # name of another of this user's active categories, whatever its type
+    name, category_type = category.name, category.type
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Category '{name}' already exists for type '{category_type}'"
+        )
+    invalidate_categories_cache(current_user["id"])
 
     return CategoryResponse.model_validate(category)
 
@@ -160,21 +191,24 @@ def delete_category(
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    # Check if category is used in user's transactions or budgets
-    transaction_count = session.query(func.count(Transaction.id)).filter(
-        Transaction.user_id == current_user["id"],
-        Transaction.category == category.name
+    # Check if category is used in user's transactions or budgets (one round-trip, stops at first match)
+    used_in_transactions = and_(Transaction.user_id == current_user["id"], Transaction.category == category.name)
+    used_in_budgets = and_(BudgetPlan.user_id == current_user["id"], BudgetPlan.category == category.name)
+    in_use = session.execute(
+        select(exists().where(used_in_transactions) | exists().where(used_in_budgets))
     ).scalar()
 
-    budget_count = session.query(func.count(BudgetPlan.id)).filter(
-        BudgetPlan.user_id == current_user["id"],
-        BudgetPlan.category == category.name
-    ).scalar()
-
-    if transaction_count > 0 or budget_count > 0:
-        # Soft delete
+    if in_use:
+        # Soft delete; counts are only needed for the message
+        transaction_count, budget_count = session.execute(
+            select(
+                select(func.count(Transaction.id)).where(used_in_transactions).scalar_subquery(),
+                select(func.count(BudgetPlan.id)).where(used_in_budgets).scalar_subquery(),
+            )
+        ).one()
         category.is_active = False
         session.commit()
+        invalidate_categories_cache(current_user["id"])
         return {
             "message": f"Category deactivated (used in {transaction_count} transactions and {budget_count} budgets)"
         }
@@ -182,6 +216,7 @@ def delete_category(
         # Hard delete if unused
         session.delete(category)
         session.commit()
+        invalidate_categories_cache(current_user["id"])
         return {"message": "Category deleted successfully"}
 
 
@@ -2,11 +2,14 @@
 Dashboard summary endpoints for budget vs actual analysis.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends
+import hashlib
+import threading
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import Date, Integer, Numeric, String, bindparam, case, func, literal, select, union_all
 
+from ..cache import TTLCache
 from ..dependencies import get_db, get_current_user
 from ..schemas import DashboardSummary, SummaryItem
 from ...data_pipeline.models import Transaction, BudgetPlan
@@ -17,127 +20,191 @@ router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 # Pipeline config
 pipeline_config = PipelineConfig()
 
-
-@router.get("/summary", response_model=DashboardSummary)
-def get_dashboard_summary(
-    year: int,
-    month: Optional[int] = None,
-    current_user: dict = Depends(get_current_user),
-    session: Session = Depends(get_db)
-):
-    """Get budget vs actual summary for dashboard."""
-    # Get actual spending from transactions for current user
-    actual_query = session.query(
-        Transaction.type,
-        Transaction.category,
+# Configured categories per summary section
+SUMMARY_CATEGORIES = {
+    "Income": frozenset(pipeline_config.categories.income_categories),
+    "Expenses": frozenset(pipeline_config.categories.expense_categories),
+    "Savings": frozenset(pipeline_config.categories.savings_categories),
+}
+
+# Monthly trend column holding each type's budget total
+TREND_BUDGET_KEYS = {
+    "Income": "IncomeBudget",
+    "Expenses": "ExpensesBudget",
+    "Savings": "SavingsBudget",
+}
+
+# Serialized summary bodies and their ETags keyed by (user_id, version, year, month);
+# the charts on the dashboard page request the same summary repeatedly
+SUMMARY_CACHE_TTL_SECONDS = 30
+_summary_cache = TTLCache(maxsize=4096, ttl=SUMMARY_CACHE_TTL_SECONDS)
+
+# Per-user write counter. A summary request reads the version before it
+# queries, so a summary computed concurrently with a write (possibly from
+# pre-commit data) is cached under the version that write retires
+_summary_versions: dict = {}
+_summary_versions_lock = threading.Lock()
+
+
+def invalidate_dashboard_cache(user_id: int) -> None:
+    """Retire a user's cached dashboard summaries after a transaction or budget write commits."""
+    with _summary_versions_lock:
+        _summary_versions[user_id] = _summary_versions.get(user_id, 0) + 1
+    _summary_cache.pop_where(lambda key: key[0] == user_id)
+
+
+def summary_query(by_month: bool):
+    """
+    Build every aggregate the dashboard summary needs as one UNION ALL.
+
+    Each branch tags its rows with a src column:
+    - actual: transaction totals per (type, category) for the period
+    - prev: transaction totals per (type, category) for the same period last year
+    - budget: budget per (type, category); total is the month's own budget
+      (month view) or the yearly budget (year view), falling back to the other
+      kind, and month is NULL when a month view fell back to the yearly budget
+    - essentials: total Essentials expenses (fixed costs) for the period
+    - latest: the user's most recent transaction date
+
+    Current and previous year totals come from a single grouped branch that
+    spans both years, tagged by a CASE on the year. Rows come back ordered by
+    total (largest first), then type and category, so the summary items can be
+    emitted in display order without sorting them in Python. Budget totals of
+    exactly zero are dropped by HAVING, since a missing budget already counts as
+    zero; actual totals are kept even when they net to zero, because an actual
+    row is what lets a budgeted category outside the configured list through.
+
+    The statement takes :user_id, :year and :previous_year (plus :month when
+    by_month) as bound parameters, so it is built once and reused.
+    """
+    user_id = bindparam("user_id", type_=Integer)
+    year = bindparam("year", type_=Integer)
+    previous_year = bindparam("previous_year", type_=Integer)
+    month = bindparam("month", type_=Integer)
+
+    no_text = literal(None, String)
+    no_month = literal(None, Integer)
+    no_total = literal(None, Numeric)
+    no_date = literal(None, Date)
+
+    def period(query, *years):
+        query = query.where(Transaction.user_id == user_id, Transaction.year.in_(years))
+        return query.where(Transaction.month == month) if by_month else query
+
+    actual = period(select(
+        case((Transaction.year == year, "actual"), else_="prev").label("src"),
+        Transaction.type.label("type"),
+        Transaction.category.label("category"),
+        no_month.label("month"),
         func.sum(Transaction.amount).label("total"),
-    ).filter(
-        Transaction.user_id == current_user["id"],
-        Transaction.year == year
-    )
-
-    if month:
-        actual_query = actual_query.filter(Transaction.month == month)
-
-    actual_query = actual_query.group_by(Transaction.type, Transaction.category)
-    actuals = {(r.type, r.category): float(r.total) for r in actual_query.all()}
-
-    # Get budgets - aggregate monthly budgets if viewing full year
+        no_date.label("latest"),
+    ), year, previous_year).group_by(Transaction.year, Transaction.type, Transaction.category)
+
+    # Monthly budgets take precedence for a month, yearly budgets for a year
+    preferred = BudgetPlan.month.isnot(None) if by_month else BudgetPlan.month.is_(None)
+    budget_total = func.coalesce(func.sum(case((preferred, BudgetPlan.amount))), func.sum(BudgetPlan.amount))
+    budget = select(
+        literal("budget"),
+        BudgetPlan.type,
+        BudgetPlan.category,
+        func.max(BudgetPlan.month),
+        budget_total,
+        no_date,
+    ).where(BudgetPlan.user_id == user_id, BudgetPlan.year == year)
+    if by_month:
+        # That month's budget OR the yearly budget
+        budget = budget.where((BudgetPlan.month == month) | (BudgetPlan.month.is_(None)))
+    budget = budget.group_by(BudgetPlan.type, BudgetPlan.category).having(budget_total != 0)
+
+    essentials = period(select(
+        literal("essentials"), no_text, no_text, no_month, func.sum(Transaction.amount), no_date
+    ), year).where(Transaction.type == "Expenses", Transaction.sub_type == "Essentials")
+
+    latest = select(
+        literal("latest"), no_text, no_text, no_month, no_total, func.max(Transaction.date)
+    ).where(Transaction.user_id == user_id)
+
+    summary = union_all(actual, budget, essentials, latest)
+    columns = summary.selected_columns
+    return summary.order_by(columns.total.desc(), columns.type, columns.category)
+
+
+# Built once per shape; requests only bind parameters, which skips statement
+# construction and reuses the memoized cache key for the compiled SQL
+YEAR_SUMMARY_QUERY = summary_query(by_month=False)
+MONTH_SUMMARY_QUERY = summary_query(by_month=True)
+
+
+def load_dashboard_summary(session: Session, user_id: int, year: int, month: Optional[int]) -> DashboardSummary:
+    """Compute the budget vs actual summary for a user's year or month."""
+    params = {"user_id": user_id, "year": year, "previous_year": year - 1}
     if month:
-        # For a specific month: get that month's budget OR yearly budget (divided by 12)
-        budget_query = session.query(BudgetPlan).filter(
-            BudgetPlan.user_id == current_user["id"],
-            BudgetPlan.year == year
-        )
-        budget_query = budget_query.filter(
-            (BudgetPlan.month == month) | (BudgetPlan.month.is_(None))
-        )
-
-        # Separate yearly and monthly budgets to ensure monthly takes precedence
-        budgets = {}
-        yearly_budgets = {}
-        monthly_budgets = {}
-
-        for b in budget_query.all():
-            key = (b.type, b.category)
-            if b.month is None:
-                yearly_budgets[key] = float(b.amount) / 12
-            else:
-                monthly_budgets[key] = float(b.amount)
-
-        # Monthly budgets take precedence over yearly
-        for key in set(list(yearly_budgets.keys()) + list(monthly_budgets.keys())):
-            if key in monthly_budgets:
-                budgets[key] = monthly_budgets[key]
-            else:
-                budgets[key] = yearly_budgets[key]
-    else:
-        # For full year: sum all monthly budgets OR use yearly budget
-        all_budgets = session.query(BudgetPlan).filter(
-            BudgetPlan.user_id == current_user["id"],
-            BudgetPlan.year == year
-        ).all()
-
-        budgets = {}
-        yearly_budgets = {}  # Track yearly budgets
-        monthly_sums = {}  # Track sum of monthly budgets
-
-        for b in all_budgets:
-            key = (b.type, b.category)
-            if b.month is None:
-                yearly_budgets[key] = float(b.amount)
-            else:
-                if key not in monthly_sums:
-                    monthly_sums[key] = 0.0
-                monthly_sums[key] += float(b.amount)
-
-        # Prefer yearly budget if it exists, otherwise use monthly sum
-        for key in set(list(yearly_budgets.keys()) + list(monthly_sums.keys())):
-            if key in yearly_budgets:
-                # Yearly budget takes precedence
-                budgets[key] = yearly_budgets[key]
-            elif key in monthly_sums:
-                # No yearly budget, sum up monthly budgets
-                budgets[key] = monthly_sums[key]
-
-    # Build summary for each type
-    def build_summary(trans_type: str, categories: List[str]) -> List[SummaryItem]:
-        items = []
-        # Include all categories that have either budget OR actual
-        all_cats = set(categories)
-        # Also include categories that have actuals even if not in the predefined list
-        for type_, cat in actuals.keys():
-            if type_ == trans_type:
-                all_cats.add(cat)
-
-        for cat in all_cats:
-            actual = actuals.get((trans_type, cat), 0.0)
-            budget = budgets.get((trans_type, cat), 0.0)
-            remaining = max(0, budget - actual)
-
-            # Calculate percentage
-            if budget > 0:
-                percent = (actual / budget * 100)
-            elif actual > 0:
-                # Has actual but no budget - show as over 100%
-                percent = 100.0
-            else:
-                percent = 0.0
-
-            if actual > 0 or budget > 0:
-                items.append(SummaryItem(
-                    type=trans_type,
-                    category=cat,
-                    budget=budget,
-                    actual=actual,
-                    remaining=remaining,
-                    percent_complete=round(percent, 1),
-                ))
-        return sorted(items, key=lambda x: x.actual, reverse=True)
-
-    income_summary = build_summary("Income", pipeline_config.categories.income_categories)
-    expense_summary = build_summary("Expenses", pipeline_config.categories.expense_categories)
-    savings_summary = build_summary("Savings", pipeline_config.categories.savings_categories)
+        params["month"] = month
+    query = MONTH_SUMMARY_QUERY if month else YEAR_SUMMARY_QUERY
+    rows = session.execute(query, params).all()
+
+    # Partition the single result set by its source tag; the dicts keep the
+    # query's largest-total-first order
+    actuals = {}
+    budgets = {}
+    prev_actuals = {}
+    total_fixed_costs = 0.0
+    latest_date_result = None
+    for r in rows:
+        if r.src == "actual":
+            actuals[(r.type, r.category)] = float(r.total)
+        elif r.src == "budget":
+            # A month without its own budget gets a twelfth of the yearly budget
+            budget = float(r.total)
+            budgets[(r.type, r.category)] = budget / 12 if month and r.month is None else budget
+        elif r.src == "prev":
+            prev_actuals[r.type] = prev_actuals.get(r.type, 0) + r.total
+        elif r.src == "essentials":
+            total_fixed_costs = float(r.total or 0.0)
+        elif r.src == "latest":
+            latest_date_result = r.latest
+
+    # Build summary items in one pass over the (type, category) keys that have
+    # an actual or a budget; budget-only categories must be configured for the type.
+    # Keys are visited by actual, largest first: budget-only categories count as an
+    # actual of 0, so they go between the positive and non-positive actuals
+    positive = [key for key, actual in actuals.items() if actual > 0]
+    budget_only = [key for key in budgets if key not in actuals]
+    non_positive = [key for key, actual in actuals.items() if actual <= 0]
+    items_by_type = {trans_type: [] for trans_type in SUMMARY_CATEGORIES}
+    for key in positive + budget_only + non_positive:
+        trans_type, cat = key
+        if trans_type not in items_by_type:
+            continue
+        if key not in actuals and cat not in SUMMARY_CATEGORIES[trans_type]:
+            continue
+
+        actual = actuals.get(key, 0.0)
+        budget = budgets.get(key, 0.0)
+        remaining = max(0, budget - actual)
+
+        # Calculate percentage
+        if budget > 0:
+            percent = (actual / budget * 100)
+        elif actual > 0:
+            # Has actual but no budget - show as over 100%
+            percent = 100.0
+        else:
+            percent = 0.0
+
+        if actual > 0 or budget > 0:
+            items_by_type[trans_type].append(SummaryItem(
+                type=trans_type,
+                category=cat,
+                budget=budget,
+                actual=actual,
+                remaining=remaining,
+                percent_complete=round(percent, 1),
+            ))
+
+    income_summary = items_by_type["Income"]
+    expense_summary = items_by_type["Expenses"]
+    savings_summary = items_by_type["Savings"]
 
     # Calculate totals
     total_income_actual = sum(i.actual for i in income_summary)
@@ -148,48 +215,17 @@ def get_dashboard_summary(
     total_savings_budget = sum(i.budget for i in savings_summary)
 
     # Calculate Fixed Cost Ratio = Essentials / Total Income
-    # Query transactions with sub_type='Essentials' to get actual fixed costs
-    essentials_query = session.query(func.sum(Transaction.amount)).filter(
-        Transaction.user_id == current_user["id"],
-        Transaction.type == "Expenses",
-        Transaction.sub_type == "Essentials",
-        Transaction.year == year
-    )
-    if month:
-        essentials_query = essentials_query.filter(Transaction.month == month)
-
-    total_fixed_costs = float(essentials_query.scalar() or 0.0)
     fixed_cost_ratio = (total_fixed_costs / total_income_actual * 100) if total_income_actual > 0 else 0.0
 
-    # Get previous period data for year-over-year comparison
+    # Previous period net balance for year-over-year comparison
     previous_year = year - 1
     previous_month = month  # Same month last year, or None for full year
 
-    # Query previous period net balance
-    prev_actual_query = session.query(
-        Transaction.type,
-        func.sum(Transaction.amount).label("total"),
-    ).filter(
-        Transaction.user_id == current_user["id"],
-        Transaction.year == previous_year
-    )
-
-    if previous_month:
-        prev_actual_query = prev_actual_query.filter(Transaction.month == previous_month)
-
-    prev_actual_query = prev_actual_query.group_by(Transaction.type)
-    prev_actuals = {r.type: float(r.total) for r in prev_actual_query.all()}
-
-    prev_income = prev_actuals.get("Income", 0.0)
-    prev_expenses = prev_actuals.get("Expenses", 0.0)
-    prev_savings = prev_actuals.get("Savings", 0.0)
+    prev_income = float(prev_actuals.get("Income", 0.0))
+    prev_expenses = float(prev_actuals.get("Expenses", 0.0))
+    prev_savings = float(prev_actuals.get("Savings", 0.0))
     prev_net = prev_income - prev_expenses - prev_savings
 
-    # Get latest transaction date
-    latest_date_query = session.query(func.max(Transaction.date)).filter(
-        Transaction.user_id == current_user["id"]
-    )
-    latest_date_result = latest_date_query.scalar()
     latest_transaction_date = latest_date_result.strftime("%Y-%m-%d") if latest_date_result else None
 
     return DashboardSummary(
@@ -217,59 +253,94 @@ def get_dashboard_summary(
     )
 
 
-@router.get("/monthly-trend")
-def get_monthly_trend(
+@router.get("/summary", response_model=DashboardSummary)
+def get_dashboard_summary(
     year: int,
-    categories: Optional[str] = None,
+    month: Optional[int] = None,
+    if_none_match: Optional[str] = Header(default=None),
     current_user: dict = Depends(get_current_user),
     session: Session = Depends(get_db)
 ):
-    """Get monthly spending trend for the year, optionally filtered by categories (comma-separated)."""
-    # Get actual transactions
-    query = session.query(
+    """
+    Get budget vs actual summary for dashboard.
+
+    The response carries an ETag of its body; a request whose If-None-Match
+    still matches gets 304 Not Modified without the body.
+    """
+    cache_key = (current_user["id"], _summary_versions.get(current_user["id"], 0), year, month)
+    cached = _summary_cache.get(cache_key)
+    if cached is None:
+        body = load_dashboard_summary(session, current_user["id"], year, month).model_dump_json()
+        cached = (body, f'"{hashlib.sha256(body.encode()).hexdigest()}"')
+        _summary_cache.set(cache_key, cached)
+    body, etag = cached
+
+    # no-cache: browsers keep the body but revalidate it on every request
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def trend_queries(by_category: bool):
+    """
+    Build the monthly trend's actual and budget totals per (month, type).
+
+    The statements take :user_id and :year (plus an expanding :categories list
+    when by_category) as bound parameters, so they are built once and reused.
+    """
+    user_id = bindparam("user_id", type_=Integer)
+    year = bindparam("year", type_=Integer)
+
+    actual_query = select(
         Transaction.month,
         Transaction.type,
         func.sum(Transaction.amount).label("total"),
-    ).filter(
-        Transaction.user_id == current_user["id"],
+    ).where(
+        Transaction.user_id == user_id,
         Transaction.year == year
     )
 
-    # Add category filter if provided (comma-separated list)
-    if categories:
-        category_list = [c.strip() for c in categories.split(',')]
-        query = query.filter(Transaction.category.in_(category_list))
-
-    query = query.group_by(
-        Transaction.month, Transaction.type
-    ).order_by(Transaction.month)
-
-    results = query.all()
-
-    # Get budget data
-    budget_query = session.query(
+    budget_query = select(
         BudgetPlan.month,
         BudgetPlan.type,
         func.sum(BudgetPlan.amount).label("total"),
-    ).filter(
-        BudgetPlan.user_id == current_user["id"],
+    ).where(
+        BudgetPlan.user_id == user_id,
         BudgetPlan.year == year,
         BudgetPlan.month.isnot(None)
     )
 
-    # Add category filter for budgets if provided
-    if categories:
-        category_list = [c.strip() for c in categories.split(',')]
-        budget_query = budget_query.filter(BudgetPlan.category.in_(category_list))
+    if by_category:
+        categories = bindparam("categories", expanding=True)
+        actual_query = actual_query.where(Transaction.category.in_(categories))
+        budget_query = budget_query.where(BudgetPlan.category.in_(categories))
+
+    actual_query = actual_query.group_by(
+        Transaction.month, Transaction.type
+    ).order_by(Transaction.month)
 
     budget_query = budget_query.group_by(
         BudgetPlan.month, BudgetPlan.type
     ).order_by(BudgetPlan.month)
 
-    budget_results = budget_query.all()
+    return actual_query, budget_query
+
 
-    # Organize by month
-    months = {i: {
+TREND_QUERIES = trend_queries(by_category=False)
+FILTERED_TREND_QUERIES = trend_queries(by_category=True)
+
+
+@router.get("/monthly-trend")
+def get_monthly_trend(
+    year: int,
+    categories: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    session: Session = Depends(get_db)
+):
+    """Get monthly spending trend for the year, optionally filtered by categories (comma-separated)."""
+    # Organize by month (list index is month - 1)
+    months = [{
         "month": i,
         "Income": 0,
         "Expenses": 0,
@@ -277,20 +348,32 @@ def get_monthly_trend(
         "IncomeBudget": 0,
         "ExpensesBudget": 0,
         "SavingsBudget": 0
-    } for i in range(1, 13)}
+    } for i in range(1, 13)]
+
+    # Parse category filter once (comma-separated list); blank entries are ignored
+    category_list = [c.strip() for c in categories.split(',') if c.strip()] if categories else None
+    if category_list == []:
+        # Filter names no category, so nothing can match
+        return months
+
+    # Get actual transactions and budget data (category filter only if provided)
+    params = {"user_id": current_user["id"], "year": year}
+    if category_list:
+        params["categories"] = category_list
+    actual_query, budget_query = FILTERED_TREND_QUERIES if category_list else TREND_QUERIES
+
+    results = session.execute(actual_query, params).all()
+    budget_results = session.execute(budget_query, params).all()
 
     # Fill in actual data
     for r in results:
-        if r.type in months[r.month]:
-            months[r.month][r.type] = float(r.total)
+        if r.type in TREND_BUDGET_KEYS:
+            months[r.month - 1][r.type] = float(r.total)
 
     # Fill in budget data
     for r in budget_results:
-        if r.type == "Income":
-            months[r.month]["IncomeBudget"] = float(r.total)
-        elif r.type == "Expenses":
-            months[r.month]["ExpensesBudget"] = float(r.total)
-        elif r.type == "Savings":
-            months[r.month]["SavingsBudget"] = float(r.total)
-
-    return list(months.values())
+        budget_key = TREND_BUDGET_KEYS.get(r.type)
+        if budget_key:
+            months[r.month - 1][budget_key] = float(r.total)
+
+    return months
@@ -2,21 +2,94 @@
 Export endpoints for generating Excel reports.
 """
 
-from typing import Optional
+import calendar
+from copy import copy
+from typing import Callable, Optional
 from datetime import datetime
-from io import BytesIO
+from tempfile import SpooledTemporaryFile
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, func, select
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
 
 from ..dependencies import get_db, get_current_user
 from ...data_pipeline.models import Transaction, BudgetPlan
 
 router = APIRouter(prefix="/api/export", tags=["Export"])
 
+# Rows fetched per round-trip when writing the transactions sheet
+EXPORT_BATCH_SIZE = 1000
+
+# Chunk size when streaming the finished file; it is spooled to disk past this size too
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+MONEY_FORMAT = '#,##0.00'
+PERCENT_FORMAT = '0.0%'
+
+
+def add_export_styles(wb: Workbook) -> None:
+    """Register the named styles used by the export so cells can share them by name."""
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    type_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    bold = Font(bold=True)
+    # Styles without their own font keep the workbook default, as unstyled cells would
+
+    styles = [
+        NamedStyle(name='title', font=Font(bold=True, size=14)),
+        NamedStyle(
+            name='header',
+            font=Font(bold=True, color="FFFFFF", size=12),
+            fill=header_fill,
+            border=border,
+            alignment=Alignment(horizontal="center", vertical="center"),
+        ),
+        # Type header rows
+        NamedStyle(name='type_row', font=DEFAULT_FONT, fill=type_fill, border=border),
+        NamedStyle(name='type_label', font=bold, fill=type_fill, border=border),
+        NamedStyle(name='type_money', font=bold, fill=type_fill, border=border, number_format=MONEY_FORMAT),
+        NamedStyle(name='type_percent', font=bold, fill=type_fill, border=border, number_format=PERCENT_FORMAT),
+        # Category and transaction rows
+        NamedStyle(name='cell', font=DEFAULT_FONT, border=border),
+        NamedStyle(name='money', font=DEFAULT_FONT, border=border, number_format=MONEY_FORMAT),
+        NamedStyle(name='date', font=DEFAULT_FONT, border=border, number_format='YYYY-MM-DD'),
+        NamedStyle(name='percent_good', font=Font(color="008000"), border=border, number_format=PERCENT_FORMAT),
+        NamedStyle(name='percent_bad', font=Font(color="FF0000"), border=border, number_format=PERCENT_FORMAT),
+    ]
+    for style in styles:
+        wb.add_named_style(style)
+
+
+def cell_factory(ws) -> Callable[..., WriteOnlyCell]:
+    """
+    Return a function creating write-only cells on ws with a value and named style.
+
+    Cells are copied from one template per style, so the named style is only
+    resolved once per sheet rather than for every cell.
+    """
+    templates = {}
+
+    def make_cell(value=None, style: str = 'cell') -> WriteOnlyCell:
+        template = templates.get(style)
+        if template is None:
+            template = templates[style] = WriteOnlyCell(ws)
+            template.style = style
+        cell = copy(template)
+        cell.value = value
+        return cell
+
+    return make_cell
+
 
 @router.get("/excel")
 def export_to_excel(
@@ -26,72 +99,70 @@ def export_to_excel(
     session: Session = Depends(get_db),
 ):
     """Export budget vs actual and categorized transactions to Excel."""
-    # Create workbook
-    wb = Workbook()
+    # Write-only workbook: rows are serialized as they are appended instead of
+    # being kept as cell objects until save
+    wb = Workbook(write_only=True)
+    add_export_styles(wb)
 
     # === Sheet 1: Budget vs Actual ===
-    ws_budget = wb.active
-    ws_budget.title = "Budget vs Actual"
+    ws_budget = wb.create_sheet("Budget vs Actual")
+    budget_cell = cell_factory(ws_budget)
 
-    # Header styling
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    # Column widths must be set before the first row is written
+    ws_budget.column_dimensions['A'].width = 15
+    ws_budget.column_dimensions['B'].width = 25
+    ws_budget.column_dimensions['C'].width = 15
+    ws_budget.column_dimensions['D'].width = 15
+    ws_budget.column_dimensions['E'].width = 15
+    ws_budget.column_dimensions['F'].width = 15
 
     # Title
-    period_text = f"{year}" if not month else f"{['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'][month-1]} {year}"
-    ws_budget['A1'] = f"Budget vs Actual - {period_text}"
-    ws_budget['A1'].font = Font(bold=True, size=14)
-    ws_budget.merge_cells('A1:F1')
+    period_text = f"{year}" if not month else f"{calendar.month_name[month]} {year}"
+    ws_budget.append([budget_cell(f"Budget vs Actual - {period_text}", 'title')])
+    ws_budget.merged_cells.add('A1:F1')
+    ws_budget.append([])
 
     # Headers
     headers = ['Type', 'Category', 'Budget', 'Actual', 'Remaining', '% Complete']
-    for col_num, header in enumerate(headers, 1):
-        cell = ws_budget.cell(row=3, column=col_num)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = border
-
-    # Get budget data for current user
-    budget_query = session.query(BudgetPlan).filter(
-        BudgetPlan.user_id == current_user["id"],
-        BudgetPlan.year == year
-    )
-    if month:
-        budget_query = budget_query.filter(BudgetPlan.month == month)
-    else:
-        budget_query = budget_query.filter(BudgetPlan.month.is_(None))
-    budgets = budget_query.all()
+    ws_budget.append([budget_cell(header, 'header') for header in headers])
 
-    # Get actual transactions for current user
-    trans_query = session.query(
+    # Actual totals per type/category for current user
+    actuals = select(
         Transaction.type,
         Transaction.category,
         func.sum(Transaction.amount).label("total")
-    ).filter(
+    ).where(
         Transaction.user_id == current_user["id"],
         Transaction.year == year
     )
-
     if month:
-        trans_query = trans_query.filter(Transaction.month == month)
-
-    trans_query = trans_query.group_by(Transaction.type, Transaction.category)
-    actuals = {(r.type, r.category): float(r.total) for r in trans_query.all()}
+        actuals = actuals.where(Transaction.month == month)
+    actuals = actuals.group_by(Transaction.type, Transaction.category).subquery()
+
+    # Budgets for current user joined to their actuals in one query
+    budget_query = select(
+        BudgetPlan.type,
+        BudgetPlan.category,
+        BudgetPlan.amount,
+        func.coalesce(actuals.c.total, 0).label("actual")
+    ).outerjoin(
+        actuals,
+        and_(actuals.c.type == BudgetPlan.type, actuals.c.category == BudgetPlan.category)
+    ).where(
+        BudgetPlan.user_id == current_user["id"],
+        BudgetPlan.year == year
+    )
+    if month:
+        budget_query = budget_query.where(BudgetPlan.month == month)
+    else:
+        budget_query = budget_query.where(BudgetPlan.month.is_(None))
+    budgets = session.execute(budget_query.order_by(BudgetPlan.type, BudgetPlan.category))
 
     # Build data structure
     data_by_type = {'Income': [], 'Expenses': [], 'Savings': []}
 
     for budget in budgets:
-        actual = actuals.get((budget.type, budget.category), 0.0)
+        actual = float(budget.actual)
         remaining = float(budget.amount) - actual
         percent = (actual / float(budget.amount) * 100) if budget.amount > 0 else 0
 
@@ -104,7 +175,6 @@ def export_to_excel(
         })
 
     # Write data
-    row = 4
     for trans_type in ['Income', 'Expenses', 'Savings']:
         type_data = data_by_type[trans_type]
         if not type_data:
@@ -116,133 +186,104 @@ def export_to_excel(
         type_remaining = type_budget - type_actual
         type_percent = (type_actual / type_budget * 100) if type_budget > 0 else 0
 
-        # Type header row
-        ws_budget.cell(row=row, column=1).value = trans_type
-        ws_budget.cell(row=row, column=1).font = Font(bold=True)
-        ws_budget.cell(row=row, column=3).value = type_budget
-        ws_budget.cell(row=row, column=3).font = Font(bold=True)
-        ws_budget.cell(row=row, column=3).number_format = '#,##0.00'
-        ws_budget.cell(row=row, column=4).value = type_actual
-        ws_budget.cell(row=row, column=4).font = Font(bold=True)
-        ws_budget.cell(row=row, column=4).number_format = '#,##0.00'
-        ws_budget.cell(row=row, column=5).value = type_remaining
-        ws_budget.cell(row=row, column=5).font = Font(bold=True)
-        ws_budget.cell(row=row, column=5).number_format = '#,##0.00'
-        ws_budget.cell(row=row, column=6).value = type_percent / 100
-        ws_budget.cell(row=row, column=6).font = Font(bold=True)
-        ws_budget.cell(row=row, column=6).number_format = '0.0%'
-
-        # Apply background color for type row
-        type_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
-        for col in range(1, 7):
-            ws_budget.cell(row=row, column=col).fill = type_fill
-            ws_budget.cell(row=row, column=col).border = border
-
-        row += 1
+        # Type header row (with background color)
+        ws_budget.append([
+            budget_cell(trans_type, 'type_label'),
+            budget_cell(None, 'type_row'),
+            budget_cell(type_budget, 'type_money'),
+            budget_cell(type_actual, 'type_money'),
+            budget_cell(type_remaining, 'type_money'),
+            budget_cell(type_percent / 100, 'type_percent'),
+        ])
 
         # Category rows
         for item in type_data:
-            ws_budget.cell(row=row, column=2).value = item['category']
-            ws_budget.cell(row=row, column=3).value = item['budget']
-            ws_budget.cell(row=row, column=3).number_format = '#,##0.00'
-            ws_budget.cell(row=row, column=4).value = item['actual']
-            ws_budget.cell(row=row, column=4).number_format = '#,##0.00'
-            ws_budget.cell(row=row, column=5).value = item['remaining']
-            ws_budget.cell(row=row, column=5).number_format = '#,##0.00'
-            ws_budget.cell(row=row, column=6).value = item['percent'] / 100
-            ws_budget.cell(row=row, column=6).number_format = '0.0%'
-
             # Color code based on performance
             if trans_type == 'Income':
                 # Green if over budget (good), red if under
-                if item['actual'] >= item['budget']:
-                    ws_budget.cell(row=row, column=6).font = Font(color="008000")
-                else:
-                    ws_budget.cell(row=row, column=6).font = Font(color="FF0000")
+                on_track = item['actual'] >= item['budget']
             else:
                 # Green if under budget (good), red if over
-                if item['actual'] <= item['budget']:
-                    ws_budget.cell(row=row, column=6).font = Font(color="008000")
-                else:
-                    ws_budget.cell(row=row, column=6).font = Font(color="FF0000")
+                on_track = item['actual'] <= item['budget']
 
-            for col in range(1, 7):
-                ws_budget.cell(row=row, column=col).border = border
+            ws_budget.append([
+                budget_cell(),
+                budget_cell(item['category']),
+                budget_cell(item['budget'], 'money'),
+                budget_cell(item['actual'], 'money'),
+                budget_cell(item['remaining'], 'money'),
+                budget_cell(item['percent'] / 100, 'percent_good' if on_track else 'percent_bad'),
+            ])
 
-            row += 1
-
-        row += 1  # Empty row between types
-
-    # Adjust column widths
-    ws_budget.column_dimensions['A'].width = 15
-    ws_budget.column_dimensions['B'].width = 25
-    ws_budget.column_dimensions['C'].width = 15
-    ws_budget.column_dimensions['D'].width = 15
-    ws_budget.column_dimensions['E'].width = 15
-    ws_budget.column_dimensions['F'].width = 15
+        ws_budget.append([])  # Empty row between types
 
     # === Sheet 2: Categorized Transactions ===
     ws_trans = wb.create_sheet("Transactions")
+    trans_cell = cell_factory(ws_trans)
+
+    # Column widths must be set before the first row is written
+    ws_trans.column_dimensions['A'].width = 12
+    ws_trans.column_dimensions['B'].width = 15
+    ws_trans.column_dimensions['C'].width = 25
+    ws_trans.column_dimensions['D'].width = 12
+    ws_trans.column_dimensions['E'].width = 50
+    ws_trans.column_dimensions['F'].width = 10
+    ws_trans.column_dimensions['G'].width = 8
 
     # Title
-    ws_trans['A1'] = f"Categorized Transactions - {period_text}"
-    ws_trans['A1'].font = Font(bold=True, size=14)
-    ws_trans.merge_cells('A1:G1')
+    ws_trans.append([trans_cell(f"Categorized Transactions - {period_text}", 'title')])
+    ws_trans.merged_cells.add('A1:G1')
+    ws_trans.append([])
 
     # Headers
     trans_headers = ['Date', 'Type', 'Category', 'Amount', 'Description', 'Source', 'Month']
-    for col_num, header in enumerate(trans_headers, 1):
-        cell = ws_trans.cell(row=3, column=col_num)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = border
-
-    # Get transactions for current user
-    transactions_query = session.query(Transaction).filter(
+    ws_trans.append([trans_cell(header, 'header') for header in trans_headers])
+
+    # Stream transactions for current user (only the exported columns)
+    transactions_query = select(
+        Transaction.date,
+        Transaction.type,
+        Transaction.category,
+        Transaction.amount,
+        Transaction.description,
+        Transaction.source,
+        Transaction.month,
+    ).where(
         Transaction.user_id == current_user["id"],
         Transaction.year == year
     )
     if month:
-        transactions_query = transactions_query.filter(Transaction.month == month)
-    transactions = transactions_query.order_by(Transaction.date.desc()).all()
+        transactions_query = transactions_query.where(Transaction.month == month)
+    transactions = session.execute(
+        transactions_query.order_by(Transaction.date.desc()).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
 
     # Write transaction data
-    for idx, trans in enumerate(transactions, start=4):
-        ws_trans.cell(row=idx, column=1).value = trans.date
-        ws_trans.cell(row=idx, column=1).number_format = 'YYYY-MM-DD'
-        ws_trans.cell(row=idx, column=2).value = trans.type
-        ws_trans.cell(row=idx, column=3).value = trans.category
-        ws_trans.cell(row=idx, column=4).value = float(trans.amount)
-        ws_trans.cell(row=idx, column=4).number_format = '#,##0.00'
-        ws_trans.cell(row=idx, column=5).value = trans.description or ''
-        ws_trans.cell(row=idx, column=6).value = trans.source
-        ws_trans.cell(row=idx, column=7).value = trans.month
-
-        # Apply borders
-        for col in range(1, 8):
-            ws_trans.cell(row=idx, column=col).border = border
-
-    # Adjust column widths
-    ws_trans.column_dimensions['A'].width = 12
-    ws_trans.column_dimensions['B'].width = 15
-    ws_trans.column_dimensions['C'].width = 25
-    ws_trans.column_dimensions['D'].width = 12
-    ws_trans.column_dimensions['E'].width = 50
-    ws_trans.column_dimensions['F'].width = 10
-    ws_trans.column_dimensions['G'].width = 8
-
-    # Save to BytesIO
-    excel_file = BytesIO()
+    for trans in transactions:
+        ws_trans.append([
+            trans_cell(trans.date, 'date'),
+            trans_cell(trans.type),
+            trans_cell(trans.category),
+            trans_cell(float(trans.amount), 'money'),
+            trans_cell(trans.description or ''),
+            trans_cell(trans.source),
+            trans_cell(trans.month),
+        ])
+
+    # Save to a spooled temp file (kept in memory while small) and stream it back
+    excel_file = SpooledTemporaryFile(max_size=EXPORT_CHUNK_SIZE * 16)
     wb.save(excel_file)
     excel_file.seek(0)
 
     # Create filename
     filename = f"LUCID_Finance_{period_text.replace(' ', '_')}.xlsx"
 
+    def iter_file():
+        with excel_file:
+            yield from iter(lambda: excel_file.read(EXPORT_CHUNK_SIZE), b"")
+
     return StreamingResponse(
-        excel_file,
+        iter_file(),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
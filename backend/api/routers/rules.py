@@ -2,19 +2,28 @@
 Categorization rules endpoints for automated transaction categorization.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from ..dependencies import get_db, get_current_user, db_manager
-from ..schemas import RuleCreate, RuleUpdate, RuleResponse
+from ..cache import TTLCache
+from ..dependencies import get_db, get_current_user
+from .dashboard import invalidate_dashboard_cache
+from ..schemas import RuleCreate, RuleUpdate, RuleResponse, RuleListAdapter
 from ...data_pipeline.models import CategorizationRule, Transaction
-from ...data_pipeline.config import PipelineConfig
+from ...data_pipeline.transformers import RuleMatcher
 
 router = APIRouter(prefix="/api/rules", tags=["Rules"])
 
-# Pipeline config
-pipeline_config = PipelineConfig()
+# Rows fetched per round-trip and ids per UPDATE when re-applying rules
+APPLY_RULES_BATCH_SIZE = 1000
+
+# Serialized JSON bodies of get_rules, keyed by the is_active filter.
+# Rules are global, so every write clears the whole cache.
+RULES_CACHE_TTL_SECONDS = 60
+_rules_response_cache = TTLCache(maxsize=8, ttl=RULES_CACHE_TTL_SECONDS)
 
 
 @router.get("", response_model=List[RuleResponse])
@@ -24,16 +33,24 @@ def get_rules(
     session: Session = Depends(get_db),
 ):
     """Get all categorization rules, ordered by priority (highest first)."""
-    query = session.query(CategorizationRule).order_by(
+    body = _rules_response_cache.get(is_active)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    query = select(
+        *(getattr(CategorizationRule, field) for field in RuleResponse.model_fields)
+    ).order_by(
         CategorizationRule.priority.desc(),
         CategorizationRule.created_at.desc()
     )
 
     if is_active is not None:
-        query = query.filter(CategorizationRule.is_active == is_active)
+        query = query.where(CategorizationRule.is_active == is_active)
 
-    rules = query.all()
-    return [RuleResponse.model_validate(rule) for rule in rules]
+    rules = session.execute(query).mappings().all()
+    body = RuleListAdapter.dump_json(RuleListAdapter.validate_python(rules))
+    _rules_response_cache.set(is_active, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("", response_model=RuleResponse)
@@ -56,6 +73,7 @@ def create_rule(
     )
     session.add(new_rule)
     session.commit()
+    _rules_response_cache.clear()
     session.refresh(new_rule)
 
     return RuleResponse.model_validate(new_rule)
@@ -92,6 +110,7 @@ def update_rule(
         rule.is_active = rule_data.is_active
 
     session.commit()
+    _rules_response_cache.clear()
     session.refresh(rule)
 
     return RuleResponse.model_validate(rule)
@@ -110,6 +129,7 @@ def delete_rule(
 
     session.delete(rule)
     session.commit()
+    _rules_response_cache.clear()
 
     return {"message": "Rule deleted successfully", "id": rule_id}
 
@@ -123,8 +143,6 @@ def apply_rules_to_transactions(
     Re-categorize existing transactions based on current active rules.
     This checks all transactions and updates their type/category if they match a rule.
     """
-    from ...data_pipeline.transformers import TransactionTransformer
-
     # Get all active rules
     rules = session.query(CategorizationRule).filter(
         CategorizationRule.is_active.is_(True)
@@ -136,40 +154,60 @@ def apply_rules_to_transactions(
     if not rules:
         return {"message": "No active rules to apply", "updated_count": 0}
 
-    # Get all transactions for current user
-    transactions = session.query(Transaction).filter(
-        Transaction.user_id == current_user["id"]
-    ).all()
+    # Stream only the columns the matcher needs instead of loading full ORM objects
+    rows = session.execute(
+        select(
+            Transaction.id,
+            Transaction.description,
+            Transaction.amount,
+            Transaction.type,
+            Transaction.category,
+        ).where(
+            Transaction.user_id == current_user["id"]
+        ).execution_options(yield_per=APPLY_RULES_BATCH_SIZE)
+    )
 
-    if not transactions:
-        return {"message": "No transactions to process", "updated_count": 0}
+    # Prepare the rules loaded above once (lowercased patterns, resolved amount
+    # operators), so each row costs one lowercase plus substring checks that stop
+    # at the first match; a transformer would re-query them and log every match
+    matcher = RuleMatcher(rules)
 
-    # Create transformer to check rules
-    transformer = TransactionTransformer(pipeline_config, db_manager)
+    # Group changed transaction ids by their new (type, category)
+    changes: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    total_transactions = 0
 
-    updated_count = 0
+    for row in rows:
+        total_transactions += 1
 
-    for transaction in transactions:
-        # Check if transaction matches any rule
-        description = transaction.description or ""
-        amount = float(transaction.amount)
+        # Same matching logic the transformer uses on import
+        rule = row.description and matcher.match(row.description, float(row.amount))
 
-        # Use transformer's rule checking logic
-        match = transformer._check_custom_rules(description, amount)
+        # Only update if different
+        if rule and (row.type, row.category) != (rule.type, rule.category):
+            changes[(rule.type, rule.category)].append(row.id)
 
-        if match:
-            new_type, new_category = match
-            # Only update if different
-            if transaction.type != new_type or transaction.category != new_category:
-                transaction.type = new_type
-                transaction.category = new_category
-                updated_count += 1
+    if total_transactions == 0:
+        return {"message": "No transactions to process", "updated_count": 0}
+
+    # One UPDATE per target (type, category) and batch, instead of one per row at commit
+    updated_count = 0
+    for (new_type, new_category), ids in changes.items():
+        for start in range(0, len(ids), APPLY_RULES_BATCH_SIZE):
+            batch = ids[start:start + APPLY_RULES_BATCH_SIZE]
+            session.execute(
+                update(Transaction)
+                .where(Transaction.user_id == current_user["id"], Transaction.id.in_(batch))
+                .values(type=new_type, category=new_category)
+                .execution_options(synchronize_session=False)
+            )
+        updated_count += len(ids)
 
     session.commit()
+    invalidate_dashboard_cache(current_user["id"])
 
     return {
         "message": f"Successfully re-categorized {updated_count} transactions",
         "updated_count": updated_count,
-        "total_transactions": len(transactions),
+        "total_transactions": total_transactions,
         "active_rules": len(rules)
     }
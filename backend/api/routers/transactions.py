@@ -2,15 +2,27 @@
 Transaction CRUD endpoints for managing financial transactions.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Request
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import lambda_stmt, select, update
 from sqlalchemy.orm import Session
 from pathlib import Path
-import shutil
 import hashlib
 
-from ..dependencies import get_db, get_current_user
-from ..schemas import TransactionResponse, TransactionUpdate, TransactionCreate, BulkTransactionUpdate
+from ..cache import TTLCache
+from ..dependencies import get_db, get_current_user, db_manager
+from .dashboard import invalidate_dashboard_cache
+from ..schemas import (
+    TransactionResponse,
+    TransactionAdapter,
+    TransactionListAdapter,
+    TransactionUpdate,
+    TransactionCreate,
+    BulkTransactionUpdate,
+)
 from ...data_pipeline.models import Transaction
 from ...data_pipeline.pipeline import TransactionPipeline
 from decimal import Decimal
@@ -18,6 +30,34 @@ from datetime import datetime
 
 router = APIRouter(prefix="/api/transactions", tags=["Transactions"])
 
+# Rows fetched and encoded per chunk by the NDJSON stream
+STREAM_BATCH_SIZE = 500
+
+# Distinct transaction years per user (served by /api/years), dropped whenever
+# the user's transactions are created, deleted or imported
+YEARS_CACHE_TTL_SECONDS = 60
+_years_cache = TTLCache(maxsize=1024, ttl=YEARS_CACHE_TTL_SECONDS)
+
+
+def get_available_years(session: Session, user_id: int) -> List[int]:
+    """Return the years with transaction data for a user, newest first."""
+    years = _years_cache.get(user_id)
+    if years is None:
+        # lambda_stmt caches the compiled SQL; user_id becomes a bound parameter
+        years = list(session.execute(lambda_stmt(
+            lambda: select(Transaction.year)
+            .where(Transaction.user_id == user_id)
+            .distinct()
+            .order_by(Transaction.year.desc())
+        )).scalars())
+        _years_cache.set(user_id, years)
+    return years
+
+
+def invalidate_years_cache(user_id: int) -> None:
+    """Drop a user's cached years after their transactions change."""
+    _years_cache.pop(user_id)
+
 
 def get_sub_type_from_budget(session: Session, user_id: int, category: str) -> Optional[str]:
     """
@@ -113,6 +153,37 @@ def generate_manual_transaction_hash(date, amount: float, description: str, tran
     return hashlib.sha256(hash_string.encode()).hexdigest()
 
 
+def transactions_query(
+    user_id: int,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    type: Optional[str] = None,
+    category: Optional[str] = None,
+    amount_min: Optional[float] = None,
+    amount_max: Optional[float] = None,
+):
+    """Select the response columns of a user's transactions matching the filters, newest first."""
+    # Only the response columns as plain rows (no ORM instances)
+    query = select(
+        *(getattr(Transaction, field) for field in TransactionResponse.model_fields)
+    ).where(Transaction.user_id == user_id)
+
+    if year:
+        query = query.where(Transaction.year == year)
+    if month:
+        query = query.where(Transaction.month == month)
+    if type:
+        query = query.where(Transaction.type == type)
+    if category:
+        query = query.where(Transaction.category == category)
+    if amount_min is not None:
+        query = query.where(Transaction.amount >= amount_min)
+    if amount_max is not None:
+        query = query.where(Transaction.amount <= amount_max)
+
+    return query.order_by(Transaction.date.desc())
+
+
 @router.get("", response_model=List[TransactionResponse])
 def get_transactions(
     year: Optional[int] = None,
@@ -127,26 +198,45 @@ def get_transactions(
     session: Session = Depends(get_db),
 ):
     """Get transactions with optional filters."""
-    # Filter by current user
-    query = session.query(Transaction).filter(Transaction.user_id == current_user["id"])
+    query = transactions_query(
+        current_user["id"], year, month, type, category, amount_min, amount_max
+    ).offset(offset).limit(limit)
+    rows = session.execute(query).mappings().all()
 
-    if year:
-        query = query.filter(Transaction.year == year)
-    if month:
-        query = query.filter(Transaction.month == month)
-    if type:
-        query = query.filter(Transaction.type == type)
-    if category:
-        query = query.filter(Transaction.category == category)
-    if amount_min is not None:
-        query = query.filter(Transaction.amount >= amount_min)
-    if amount_max is not None:
-        query = query.filter(Transaction.amount <= amount_max)
+    # Encode straight to JSON bytes in pydantic-core, skipping FastAPI's second
+    # validation and serialization pass over up to 5000 rows
+    transactions = TransactionListAdapter.validate_python(rows)
+    return Response(content=TransactionListAdapter.dump_json(transactions), media_type="application/json")
 
-    query = query.order_by(Transaction.date.desc())
-    transactions = query.offset(offset).limit(limit).all()
 
-    return [TransactionResponse.model_validate(t) for t in transactions]
+@router.get("/stream")
+def stream_transactions(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    type: Optional[str] = None,
+    category: Optional[str] = None,
+    amount_min: Optional[float] = None,
+    amount_max: Optional[float] = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Stream all matching transactions as NDJSON, one TransactionResponse per line.
+
+    Unlike the paged list there is no limit: rows are read from a server-side
+    cursor in batches and each batch is sent as soon as it is encoded.
+    """
+    query = transactions_query(
+        current_user["id"], year, month, type, category, amount_min, amount_max
+    ).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    def generate():
+        # The body is produced after the handler returns, so use a dedicated session
+        with db_manager.get_session() as session:
+            for batch in session.execute(query).mappings().partitions():
+                transactions = TransactionListAdapter.validate_python(batch)
+                yield b"".join(TransactionAdapter.dump_json(t) + b"\n" for t in transactions)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.post("", response_model=TransactionResponse)
@@ -196,6 +286,8 @@ def create_transaction(
 
     session.add(new_transaction)
     session.commit()
+    invalidate_years_cache(current_user["id"])
+    invalidate_dashboard_cache(current_user["id"])
     session.refresh(new_transaction)
 
     return TransactionResponse.model_validate(new_transaction)
@@ -251,6 +343,7 @@ def update_transaction(
         transaction.sub_type = auto_set_sub_type(current_category, update.sub_type, session, current_user["id"], current_type)
 
     session.commit()
+    invalidate_dashboard_cache(current_user["id"])
     session.refresh(transaction)
     return TransactionResponse.model_validate(transaction)
 
@@ -281,38 +374,45 @@ def bulk_update_transactions(
     session: Session = Depends(get_db)
 ):
     """Bulk update multiple transactions' type and/or category."""
-    # Verify all transactions belong to the current user
-    transactions = session.query(Transaction).filter(
-        Transaction.id.in_(bulk_update.transaction_ids),
-        Transaction.user_id == current_user["id"]
+    # Verify all transactions belong to the current user (only the columns the update depends on)
+    rows = session.execute(
+        select(Transaction.id, Transaction.type, Transaction.category).where(
+            Transaction.id.in_(bulk_update.transaction_ids),
+            Transaction.user_id == current_user["id"]
+        )
     ).all()
 
-    if len(transactions) != len(bulk_update.transaction_ids):
+    if len(rows) != len(bulk_update.transaction_ids):
         raise HTTPException(status_code=404, detail="One or more transactions not found or unauthorized")
 
-    # Update all transactions
-    updated_count = 0
-    for transaction in transactions:
-        # Update type first
+    updated_count = len(rows)
+    if bulk_update.category is None and bulk_update.sub_type is None and bulk_update.type is None:
+        return {"updated_count": updated_count, "message": f"Successfully updated {updated_count} transactions"}
+
+    # Group transactions by their resulting (type, category) so each group is one UPDATE
+    groups: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for row in rows:
+        new_type = bulk_update.type if bulk_update.type is not None else row.type
+        new_category = row.category
         if bulk_update.type is not None:
-            transaction.type = bulk_update.type
             # Auto-set category based on type (e.g., CC_Refund -> "Card Refund")
-            transaction.category = auto_set_category_for_type(bulk_update.type, transaction.category)
-
-        # Update category
+            new_category = auto_set_category_for_type(bulk_update.type, new_category)
         if bulk_update.category is not None:
-            transaction.category = bulk_update.category
-
-        # Auto-set sub_type based on final type and category
-        current_type = bulk_update.type if bulk_update.type is not None else transaction.type
-        current_category = transaction.category
-
-        if bulk_update.category is not None or bulk_update.sub_type is not None or bulk_update.type is not None:
-            transaction.sub_type = auto_set_sub_type(current_category, bulk_update.sub_type, session, current_user["id"], current_type)
-
-        updated_count += 1
+            new_category = bulk_update.category
+        groups[(new_type, new_category)].append(row.id)
+
+    for (new_type, new_category), ids in groups.items():
+        # Auto-set sub_type based on final type and category (one budget lookup per group)
+        sub_type = auto_set_sub_type(new_category, bulk_update.sub_type, session, current_user["id"], new_type)
+        session.execute(
+            update(Transaction)
+            .where(Transaction.user_id == current_user["id"], Transaction.id.in_(ids))
+            .values(type=new_type, category=new_category, sub_type=sub_type)
+            .execution_options(synchronize_session=False)
+        )
 
     session.commit()
+    invalidate_dashboard_cache(current_user["id"])
     return {"updated_count": updated_count, "message": f"Successfully updated {updated_count} transactions"}
 
 
@@ -332,6 +432,8 @@ def delete_transaction(
 
     session.delete(transaction)
     session.commit()
+    invalidate_years_cache(current_user["id"])
+    invalidate_dashboard_cache(current_user["id"])
     return {"message": "Transaction deleted"}
 
 
@@ -434,6 +536,7 @@ def apply_sub_types_to_existing(
             updated_count += 1
 
     session.commit()
+    invalidate_dashboard_cache(current_user["id"])
     return {
         "message": f"Applied sub-types to {updated_count} transactions",
         "updated_count": updated_count
@@ -458,23 +561,26 @@ def bulk_update_by_criteria(
     if not new_type and not new_category:
         raise HTTPException(status_code=400, detail="Must provide updates")
 
-    # Filter by current user
-    query = session.query(Transaction).filter(Transaction.user_id == current_user["id"])
+    # Filter by current user and update matching rows in one statement, without loading them
+    stmt = update(Transaction).where(Transaction.user_id == current_user["id"])
     if description_filter:
-        query = query.filter(Transaction.description.ilike(f"%{description_filter}%"))
+        stmt = stmt.where(Transaction.description.ilike(f"%{description_filter}%"))
     if category_filter:
-        query = query.filter(Transaction.category == category_filter)
+        stmt = stmt.where(Transaction.category == category_filter)
+
+    values = {}
+    if new_type:
+        values["type"] = new_type
+    if new_category:
+        values["category"] = new_category
 
-    transactions = query.all()
-    count = 0
-    for trans in transactions:
-        if new_type:
-            trans.type = new_type
-        if new_category:
-            trans.category = new_category
-        count += 1
+    # The MySQL dialect reports matched rows, so rowcount includes rows already up to date
+    count = session.execute(
+        stmt.values(**values).execution_options(synchronize_session=False)
+    ).rowcount
 
     session.commit()
+    invalidate_dashboard_cache(current_user["id"])
     return {"message": f"Updated {count} transactions"}
 
 
@@ -512,6 +618,43 @@ def validate_filename(filename: str) -> tuple[bool, str]:
     return True, ""
 
 
+def process_uploaded_files(uploaded_files: List[UploadFile], user_id: int) -> dict:
+    """
+    Run uploaded CSV files through the ETL pipeline with file type auto-detection.
+    Reads each upload's spooled file directly instead of copying it to disk first.
+    Blocking; call from a worker thread when used inside an async endpoint.
+    """
+    from ...data_pipeline.extractors import identify_file_type
+
+    pipeline = TransactionPipeline(db_manager=db_manager)
+    pipeline.setup_database()
+
+    total_stats = {"inserted": 0, "skipped": 0, "errors": 0, "total": 0}
+
+    for upload in uploaded_files:
+        # Auto-detect file type (only the name is used, never as a path on disk)
+        filename = Path(upload.filename).name
+        file_type = identify_file_type(Path(filename))
+
+        # Process based on file type
+        if file_type == "UBS":
+            stats = pipeline._process_ubs_file(filename, user_id=user_id, stream=upload.file)
+        elif file_type == "CC":
+            stats = pipeline._process_cc_file(filename, user_id=user_id, stream=upload.file)
+        else:  # BCV or Generic
+            stats = pipeline._process_generic_file(filename, file_type, user_id=user_id, stream=upload.file)
+
+        # Aggregate stats
+        total_stats["inserted"] += stats.get("inserted", 0)
+        total_stats["skipped"] += stats.get("skipped", 0)
+        total_stats["errors"] += stats.get("errors", 0)
+        total_stats["total"] += stats.get("total", 0)
+
+    invalidate_years_cache(user_id)
+    invalidate_dashboard_cache(user_id)
+    return total_stats
+
+
 @router.post("/upload")
 async def upload_csv(
     request: Request,
@@ -534,51 +677,11 @@ async def upload_csv(
         if not is_valid:
             raise HTTPException(status_code=400, detail=f"Credit card file: {error_msg}")
 
-    # Create temp directory for uploads
-    upload_dir = Path("temp_uploads")
-    upload_dir.mkdir(exist_ok=True)
-
-    uploaded_files = []
+    uploaded_files = [upload for upload in (ubs_file, cc_file) if upload]
 
     try:
-        # Save uploaded files
-        if ubs_file:
-            file_path = upload_dir / ubs_file.filename
-            with open(file_path, "wb") as f:
-                shutil.copyfileobj(ubs_file.file, f)
-            uploaded_files.append(file_path)
-
-        if cc_file:
-            file_path = upload_dir / cc_file.filename
-            with open(file_path, "wb") as f:
-                shutil.copyfileobj(cc_file.file, f)
-            uploaded_files.append(file_path)
-
-        # Process files with auto-detection
-        from ...data_pipeline.extractors import identify_file_type
-
-        pipeline = TransactionPipeline()
-        pipeline.setup_database()
-
-        total_stats = {"inserted": 0, "skipped": 0, "errors": 0, "total": 0}
-
-        for file_path in uploaded_files:
-            # Auto-detect file type
-            file_type = identify_file_type(file_path)
-
-            # Process based on file type
-            if file_type == "UBS":
-                stats = pipeline._process_ubs_file(str(file_path), user_id=current_user["id"])
-            elif file_type == "CC":
-                stats = pipeline._process_cc_file(str(file_path), user_id=current_user["id"])
-            else:  # BCV or Generic
-                stats = pipeline._process_generic_file(str(file_path), file_type, user_id=current_user["id"])
-
-            # Aggregate stats
-            total_stats["inserted"] += stats.get("inserted", 0)
-            total_stats["skipped"] += stats.get("skipped", 0)
-            total_stats["errors"] += stats.get("errors", 0)
-            total_stats["total"] += stats.get("total", 0)
+        # Parsing and loading are blocking (pandas + sync DB), keep them off the event loop
+        total_stats = await run_in_threadpool(process_uploaded_files, uploaded_files, current_user["id"])
 
         return {
             "message": "Files processed successfully",
@@ -587,9 +690,3 @@ async def upload_csv(
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed. Please check the file format. Error: {str(e)}")
-
-    finally:
-        # Cleanup temp files
-        for file_path in uploaded_files:
-            if file_path.exists():
-                file_path.unlink()
@@ -5,7 +5,7 @@ Extracted from main.py for better organization.
 
 from datetime import date, datetime
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 # Transaction schemas
@@ -194,3 +194,14 @@ class RuleResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# List adapters, built once and reused by the list endpoints
+TransactionListAdapter = TypeAdapter(List[TransactionResponse])
+# Single-item adapter for line-by-line (NDJSON) encoding
+TransactionAdapter = TypeAdapter(TransactionResponse)
+BudgetPlanListAdapter = TypeAdapter(List[BudgetPlanResponse])
+CategoryInfoListAdapter = TypeAdapter(List[CategoryInfo])
+CategoryListAdapter = TypeAdapter(List[CategoryResponse])
+UserListAdapter = TypeAdapter(List[UserResponse])
+RuleListAdapter = TypeAdapter(List[RuleResponse])
@@ -14,6 +14,12 @@ class DatabaseConfig:
     password: str = os.getenv("DB_PASSWORD", "")
     database: str = os.getenv("DB_NAME", "lucid_finance")
 
+    # Connection pool; pool_size + max_overflow must stay below MySQL max_connections (50)
+    pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    pool_timeout: int = int(os.getenv("DB_POOL_TIMEOUT", "10"))  # Seconds to wait for a free connection
+    pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds before a connection is replaced
+
     @property
     def connection_string(self) -> str:
         """Generate SQLAlchemy connection string."""
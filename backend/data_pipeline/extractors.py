@@ -10,7 +10,7 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 
@@ -18,6 +18,16 @@ from .config import PipelineConfig
 
 logger = logging.getLogger(__name__)
 
+# A CSV on disk, or an already-open binary stream such as an uploaded file
+CSVSource = Union[Path, BinaryIO]
+
+
+def rewind(source: CSVSource) -> CSVSource:
+    """Seek a stream back to its start so it can be read again; paths pass through."""
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
 
 @dataclass
 class RawTransaction:
@@ -50,12 +60,12 @@ class UBSExtractor:
     def __init__(self, config: PipelineConfig):
         self.config = config
 
-    def extract(self, filepath: Path) -> Tuple[UBSMetadata, List[RawTransaction]]:
+    def extract(self, filepath: CSVSource) -> Tuple[UBSMetadata, List[RawTransaction]]:
         """
         Extract transactions from a UBS CSV file.
 
         Args:
-            filepath: Path to the UBS CSV file
+            filepath: Path to the UBS CSV file, or a binary stream of its contents
 
         Returns:
             Tuple of (metadata, list of raw transactions)
@@ -67,7 +77,7 @@ class UBSExtractor:
 
         # Read transaction data (skip metadata rows)
         df = pd.read_csv(
-            filepath,
+            rewind(filepath),
             sep=self.config.ubs_separator,
             encoding=self.config.ubs_encoding,
             skiprows=self.config.ubs_skiprows,
@@ -89,11 +99,11 @@ class UBSExtractor:
         logger.info(f"Extracted {len(transactions)} UBS transactions")
         return metadata, transactions
 
-    def _extract_metadata(self, filepath: Path) -> UBSMetadata:
+    def _extract_metadata(self, filepath: CSVSource) -> UBSMetadata:
         """Extract metadata from the first rows of UBS CSV."""
         try:
             meta_df = pd.read_csv(
-                filepath,
+                rewind(filepath),
                 sep=self.config.ubs_separator,
                 encoding=self.config.ubs_encoding,
                 nrows=self.config.ubs_metadata_rows,
@@ -193,12 +203,12 @@ class CCExtractor:
     def __init__(self, config: PipelineConfig):
         self.config = config
 
-    def extract(self, filepath: Path) -> List[RawTransaction]:
+    def extract(self, filepath: CSVSource) -> List[RawTransaction]:
         """
         Extract transactions from a Credit Card CSV file.
 
         Args:
-            filepath: Path to the CC CSV file
+            filepath: Path to the CC CSV file, or a binary stream of its contents
 
         Returns:
             List of raw transactions
@@ -207,7 +217,7 @@ class CCExtractor:
 
         # Read CSV (skip the sep=; header row)
         df = pd.read_csv(
-            filepath,
+            rewind(filepath),
             sep=self.config.cc_separator,
             encoding=self.config.cc_encoding,
             skiprows=self.config.cc_skiprows,
@@ -291,12 +301,12 @@ class GenericExtractor:
     def __init__(self, config: PipelineConfig):
         self.config = config
 
-    def extract(self, filepath: Path, bank_hint: Optional[str] = None) -> List[RawTransaction]:
+    def extract(self, filepath: CSVSource, bank_hint: Optional[str] = None) -> List[RawTransaction]:
         """
         Extract transactions from any CSV file using auto-detection.
 
         Args:
-            filepath: Path to the CSV file
+            filepath: Path to the CSV file, or a binary stream of its contents
             bank_hint: Optional hint about the bank (e.g., 'BCV', 'UBS', 'Generic')
 
         Returns:
@@ -310,7 +320,7 @@ class GenericExtractor:
 
         # Step 2: Read CSV with detected settings
         df = pd.read_csv(
-            filepath,
+            rewind(filepath),
             sep=separator,
             encoding=encoding,
             skiprows=header_row_idx,
@@ -333,7 +343,7 @@ class GenericExtractor:
         logger.info(f"Extracted {len(transactions)} transactions")
         return transactions
 
-    def _detect_format(self, filepath: Path) -> Tuple[str, str, int]:
+    def _detect_format(self, filepath: CSVSource) -> Tuple[str, str, int]:
         """
         Auto-detect CSV format: separator, encoding, and header row index.
 
@@ -350,17 +360,20 @@ class GenericExtractor:
         header_row_idx = 0
 
         # Read first 20 lines to detect format
-        with open(filepath, 'rb') as f:
-            first_bytes = f.read(4)
-            # Check for BOM (UTF-8 with BOM starts with EF BB BF)
-            if first_bytes.startswith(b'\xef\xbb\xbf'):
-                encodings = ['utf-8-sig'] + encodings
+        if hasattr(filepath, "read"):
+            first_bytes = rewind(filepath).read(4)
+        else:
+            with open(filepath, 'rb') as f:
+                first_bytes = f.read(4)
+        # Check for BOM (UTF-8 with BOM starts with EF BB BF)
+        if first_bytes.startswith(b'\xef\xbb\xbf'):
+            encodings = ['utf-8-sig'] + encodings
 
         for encoding in encodings:
             for sep in separators:
                 try:
                     # Try reading first 15 rows
-                    df_test = pd.read_csv(filepath, sep=sep, encoding=encoding, nrows=15)
+                    df_test = pd.read_csv(rewind(filepath), sep=sep, encoding=encoding, nrows=15)
 
                     # Check if we have more than 2 columns
                     if len(df_test.columns) > 2:
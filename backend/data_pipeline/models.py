@@ -1,5 +1,6 @@
 """SQLAlchemy models for the budget tracking database."""
 
+import threading
 from datetime import datetime, date
 from decimal import Decimal
 from typing import Optional
@@ -13,6 +14,7 @@ from sqlalchemy import (
     Numeric,
     Text,
     Boolean,
+    Computed,
     Index,
     UniqueConstraint,
     ForeignKey,
@@ -64,6 +66,9 @@ class Transaction(Base):
         Index("idx_year_month", "year", "month"),
         Index("idx_type_category", "type", "category"),
         Index("idx_user_date", "user_id", "date"),
+        # Covers the dashboard/trend/export aggregates (amount included so they are index-only)
+        Index("idx_user_period_summary", "user_id", "year", "month", "type", "category", "amount"),
+        Index("idx_user_type_category", "user_id", "type", "category"),
         UniqueConstraint("user_id", "transaction_hash", name="uq_user_transaction_hash"),
     )
 
@@ -137,6 +142,8 @@ class BudgetPlan(Base):
         UniqueConstraint("user_id", "year", "month", "type", "category", name="uq_user_budget_plan"),
         Index("idx_budget_year_month", "year", "month"),
         Index("idx_budget_user", "user_id"),
+        # Covering index for the dashboard's per-(type, category) budget totals
+        Index("idx_budget_user_period", "user_id", "year", "type", "category", "month", "amount"),
     )
 
     def __repr__(self) -> str:
@@ -164,8 +171,12 @@ class Category(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # The name while active, NULL once soft-deleted; unique keys ignore NULLs, so
+    # archived names can be reused (MySQL has no partial unique indexes)
+    active_name = Column(String(100), Computed("CASE WHEN is_active THEN name END", persisted=True))
+
     __table_args__ = (
-        UniqueConstraint("user_id", "name", name="uq_user_category_name"),
+        UniqueConstraint("user_id", "active_name", name="uq_user_active_category_name"),
         Index("idx_category_user", "user_id"),
     )
 
@@ -251,16 +262,25 @@ class DatabaseManager:
         self.config = config or DatabaseConfig()
         self._engine: Optional[Engine] = None
         self._session_factory = None
+        # First requests arrive concurrently on threadpool workers; without this each
+        # could build its own engine and connection pool
+        self._init_lock = threading.Lock()
 
     @property
     def engine(self) -> Engine:
-        """Get or create the database engine."""
+        """Get or create the database engine (one per manager, shared by all sessions)."""
         if self._engine is None:
-            self._engine = create_engine(
-                self.config.connection_string,
-                echo=False,
-                pool_pre_ping=True,
-            )
+            with self._init_lock:
+                if self._engine is None:
+                    self._engine = create_engine(
+                        self.config.connection_string,
+                        echo=False,
+                        pool_pre_ping=True,
+                        pool_size=self.config.pool_size,
+                        max_overflow=self.config.max_overflow,
+                        pool_timeout=self.config.pool_timeout,
+                        pool_recycle=self.config.pool_recycle,
+                    )
         return self._engine
 
     def create_tables(self) -> None:
@@ -271,11 +291,14 @@ class DatabaseManager:
         """Drop all tables (use with caution)."""
         Base.metadata.drop_all(self.engine)
 
-    def get_session(self) -> Session:
-        """Get a new database session."""
+    def get_session(self, **options) -> Session:
+        """Get a new database session. Keyword options override the sessionmaker defaults."""
         if self._session_factory is None:
-            self._session_factory = sessionmaker(bind=self.engine)
-        return self._session_factory()
+            engine = self.engine
+            with self._init_lock:
+                if self._session_factory is None:
+                    self._session_factory = sessionmaker(bind=engine)
+        return self._session_factory(**options)
 
     def init_default_categories(self, session: Session) -> None:
         """Initialize default categories from config."""
@@ -13,7 +13,7 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import BinaryIO, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -53,6 +53,7 @@ class TransactionPipeline:
         self,
         config: Optional[PipelineConfig] = None,
         db_config: Optional[DatabaseConfig] = None,
+        db_manager: Optional[DatabaseManager] = None,
     ):
         """
         Initialize the pipeline.
@@ -60,6 +61,8 @@ class TransactionPipeline:
         Args:
             config: Pipeline configuration (uses defaults if not provided)
             db_config: Database configuration (uses defaults if not provided)
+            db_manager: Existing database manager to share its connection pool
+                (creates one from the database configuration if not provided)
         """
         self.config = config or PipelineConfig()
 
@@ -67,7 +70,7 @@ class TransactionPipeline:
             self.config.database = db_config
 
         # Initialize components
-        self.db_manager = DatabaseManager(self.config.database)
+        self.db_manager = db_manager or DatabaseManager(self.config.database)
         self.ubs_extractor = UBSExtractor(self.config)
         self.cc_extractor = CCExtractor(self.config)
         self.generic_extractor = GenericExtractor(self.config)
@@ -262,13 +265,16 @@ class TransactionPipeline:
         logger.info(f"Found {len(ubs_files)} UBS, {len(cc_files)} CC, {len(generic_files)} generic files")
         return ubs_files, cc_files, generic_files
 
-    def _process_ubs_file(self, filepath: str, user_id: int = 1) -> dict:
-        """Process a single UBS file through the ETL pipeline."""
+    def _process_ubs_file(self, filepath: str, user_id: int = 1, stream: Optional[BinaryIO] = None) -> dict:
+        """
+        Process a single UBS file through the ETL pipeline.
+        If stream is given, its contents are read instead of filepath, which then only names the file.
+        """
         filename = os.path.basename(filepath)
         logger.info(f"Processing UBS file: {filename}")
 
         # Extract
-        metadata, raw_transactions = self.ubs_extractor.extract(Path(filepath))
+        metadata, raw_transactions = self.ubs_extractor.extract(stream or Path(filepath))
         logger.info(f"Extracted {len(raw_transactions)} raw transactions")
 
         # Transform
@@ -287,13 +293,16 @@ class TransactionPipeline:
 
         return stats
 
-    def _process_cc_file(self, filepath: str, user_id: int = 1) -> dict:
-        """Process a single CC file through the ETL pipeline."""
+    def _process_cc_file(self, filepath: str, user_id: int = 1, stream: Optional[BinaryIO] = None) -> dict:
+        """
+        Process a single CC file through the ETL pipeline.
+        If stream is given, its contents are read instead of filepath, which then only names the file.
+        """
         filename = os.path.basename(filepath)
         logger.info(f"Processing CC file: {filename}")
 
         # Extract
-        raw_transactions = self.cc_extractor.extract(Path(filepath))
+        raw_transactions = self.cc_extractor.extract(stream or Path(filepath))
         logger.info(f"Extracted {len(raw_transactions)} raw transactions")
 
         # Transform
@@ -312,13 +321,18 @@ class TransactionPipeline:
 
         return stats
 
-    def _process_generic_file(self, filepath: str, file_type: str, user_id: int = 1) -> dict:
-        """Process a generic CSV file (BCV, Generic) through the ETL pipeline."""
+    def _process_generic_file(
+        self, filepath: str, file_type: str, user_id: int = 1, stream: Optional[BinaryIO] = None
+    ) -> dict:
+        """
+        Process a generic CSV file (BCV, Generic) through the ETL pipeline.
+        If stream is given, its contents are read instead of filepath, which then only names the file.
+        """
         filename = os.path.basename(filepath)
         logger.info(f"Processing {file_type} file: {filename}")
 
         # Extract using GenericExtractor
-        raw_transactions = self.generic_extractor.extract(Path(filepath), bank_hint=file_type)
+        raw_transactions = self.generic_extractor.extract(stream or Path(filepath), bank_hint=file_type)
         logger.info(f"Extracted {len(raw_transactions)} raw transactions")
 
         # Transform
@@ -9,6 +9,7 @@ Applies business logic to categorize transactions based on:
 
 import hashlib
 import logging
+import operator
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -19,6 +20,48 @@ from .models import DatabaseManager, CategorizationRule
 
 logger = logging.getLogger(__name__)
 
+# Amount condition operators supported by categorization rules
+AMOUNT_OPERATORS = {
+    "eq": operator.eq,
+    "gte": operator.ge,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "lt": operator.lt,
+}
+
+
+class RuleMatcher:
+    """
+    Categorization rules prepared once for repeated matching.
+
+    Patterns are lowercased up front for case-insensitive rules and amount
+    operators are resolved, so matching a description lowercases it once and
+    then runs plain substring checks in priority order, stopping at the first
+    rule whose pattern and amount condition both hold.
+    """
+
+    def __init__(self, rules: List[CategorizationRule]):
+        self.rules = rules
+        self._checks = []
+        for rule in rules:
+            pattern = rule.pattern if rule.case_sensitive else rule.pattern.lower()
+            check = None
+            if rule.amount_operator and rule.amount_value is not None:
+                check = AMOUNT_OPERATORS.get(rule.amount_operator)
+            amount_value = float(rule.amount_value) if check else None
+            self._checks.append((pattern, rule.case_sensitive, check, amount_value, rule))
+
+    def match(self, description: str, amount: float = 0) -> Optional[CategorizationRule]:
+        """Return the highest-priority rule matching description and amount, if any."""
+        lowered = description.lower()
+        for pattern, case_sensitive, check, amount_value, rule in self._checks:
+            if pattern not in (description if case_sensitive else lowered):
+                continue
+            if check is not None and not check(amount, amount_value):
+                continue
+            return rule
+        return None
+
 
 @dataclass
 class TransformedTransaction:
@@ -43,6 +86,7 @@ class TransactionTransformer:
         self.db_manager = db_manager or DatabaseManager()
         self._rules_cache = None
         self._rules_cache_time = None
+        self._rule_matcher = None
 
     def transform(
         self,
@@ -122,37 +166,20 @@ class TransactionTransformer:
             return None
 
         rules = self._get_active_rules()
+        if not rules:
+            return None
 
-        for rule in rules:
-            # Check pattern match
-            pattern = rule.pattern
-            desc_to_check = description if rule.case_sensitive else description.lower()
-            pattern_to_check = pattern if rule.case_sensitive else pattern.lower()
-
-            if pattern_to_check not in desc_to_check:
-                continue
+        # Recompile only when the rules cache has been refreshed
+        if self._rule_matcher is None or self._rule_matcher.rules is not rules:
+            self._rule_matcher = RuleMatcher(rules)
 
-            # Pattern matches, now check amount condition if present
-            if rule.amount_operator and rule.amount_value is not None:
-                amount_value = float(rule.amount_value)
-
-                if rule.amount_operator == "eq" and amount != amount_value:
-                    continue
-                elif rule.amount_operator == "gte" and amount < amount_value:
-                    continue
-                elif rule.amount_operator == "lte" and amount > amount_value:
-                    continue
-                elif rule.amount_operator == "gt" and amount <= amount_value:
-                    continue
-                elif rule.amount_operator == "lt" and amount >= amount_value:
-                    continue
-
-            # Both pattern and amount conditions match (or no amount condition)
-            amount_info = f", amount {rule.amount_operator} {rule.amount_value}" if rule.amount_operator else ""
-            logger.info(f"Custom rule matched: '{pattern}'{amount_info} -> {rule.type}/{rule.category}")
-            return (rule.type, rule.category)
+        rule = self._rule_matcher.match(description, amount)
+        if rule is None:
+            return None
 
-        return None
+        amount_info = f", amount {rule.amount_operator} {rule.amount_value}" if rule.amount_operator else ""
+        logger.info(f"Custom rule matched: '{rule.pattern}'{amount_info} -> {rule.type}/{rule.category}")
+        return (rule.type, rule.category)
 
     def _transform_ubs(self, raw: RawTransaction) -> Optional[TransformedTransaction]:
         """Transform a UBS bank transaction."""
@@ -0,0 +1,72 @@
+"""
+Benchmark categorization rule matching.
+
+Times RuleMatcher against the per-rule loop it replaced (lowercasing the
+description again for every rule) on the worst case: no rule matches, so
+every rule is checked. Kept out of the test suite because wall-clock results
+depend on machine load and tooling.
+
+Usage:
+    uv run python ops/benchmark_rule_matcher.py
+    uv run python ops/benchmark_rule_matcher.py --rules 100 --descriptions 5000
+"""
+
+import sys
+import timeit
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.data_pipeline.models import CategorizationRule
+from backend.data_pipeline.transformers import RuleMatcher
+
+
+def per_rule_loop(rules, description):
+    """Return the first matching rule the way apply_rules did before RuleMatcher."""
+    for rule in rules:
+        text = description if rule.case_sensitive else description.lower()
+        pattern = rule.pattern if rule.case_sensitive else rule.pattern.lower()
+        if pattern in text:
+            return rule
+    return None
+
+
+def time_ms(match, descriptions, repeat: int) -> float:
+    """Return the best time in milliseconds to match every description once."""
+    return min(timeit.repeat(lambda: [match(d) for d in descriptions], number=1, repeat=repeat)) * 1000
+
+
+def main():
+    """Benchmark both matchers and print their timings."""
+    parser = argparse.ArgumentParser(description="Benchmark categorization rule matching")
+    parser.add_argument('--rules', type=int, default=50, help='Number of rules (none of them match)')
+    parser.add_argument('--descriptions', type=int, default=2000, help='Transaction descriptions to match')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per matcher (best is kept)')
+    args = parser.parse_args()
+
+    rules = [
+        CategorizationRule(pattern=f"merchant {i}", case_sensitive=i % 2 == 0, type="Expenses", category=str(i))
+        for i in range(args.rules)
+    ]
+    descriptions = [f"CARD PAYMENT {i} SOME SHOP LAUSANNE REF {i * 7}" for i in range(args.descriptions)]
+    matcher = RuleMatcher(rules)
+
+    print("=" * 60)
+    print("Rule matching benchmark")
+    print("=" * 60)
+    print(f"{args.rules} rules, {args.descriptions} descriptions, no matches")
+    print()
+
+    matcher_ms = time_ms(matcher.match, descriptions, args.repeat)
+    loop_ms = time_ms(lambda d: per_rule_loop(rules, d), descriptions, args.repeat)
+    print(f"  RuleMatcher    {matcher_ms:8.1f} ms")
+    print(f"  per-rule loop  {loop_ms:8.1f} ms")
+    print()
+    print(f"✅ RuleMatcher is {loop_ms / matcher_ms:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
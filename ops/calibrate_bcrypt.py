@@ -0,0 +1,60 @@
+"""
+Calibrate the bcrypt cost factor for this machine.
+
+Times password hashing at several cost factors and recommends the largest one
+that stays under the target latency. Put the result in .env as BCRYPT_ROUNDS.
+Existing hashes keep working after a change: the cost is stored in each hash.
+
+Usage:
+    uv run python ops/calibrate_bcrypt.py
+    uv run python ops/calibrate_bcrypt.py --target-ms 250 --samples 5
+"""
+
+import time
+import argparse
+
+import bcrypt
+
+MIN_ROUNDS = 8
+MAX_ROUNDS = 14
+
+
+def time_hash(rounds: int, samples: int) -> float:
+    """Return the median time in milliseconds to hash one password at the given cost."""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds=rounds))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    """Benchmark bcrypt cost factors and print a recommendation."""
+    parser = argparse.ArgumentParser(description="Calibrate BCRYPT_ROUNDS for this host")
+    parser.add_argument('--target-ms', type=float, default=250.0, help='Maximum hash latency in milliseconds')
+    parser.add_argument('--samples', type=int, default=3, help='Hashes to time per cost factor')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("bcrypt cost calibration")
+    print("=" * 60)
+    print(f"Target: <= {args.target_ms:.0f} ms per hash")
+    print()
+
+    recommended = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        elapsed = time_hash(rounds, args.samples)
+        print(f"  rounds={rounds:2d}  {elapsed:8.1f} ms")
+        if elapsed > args.target_ms:
+            break
+        recommended = rounds
+
+    print()
+    print(f"✅ Recommended: BCRYPT_ROUNDS={recommended}")
+    print("   Add this line to .env and restart the backend.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Database Migration: Add Query Indexes
+=====================================
+Adds composite indexes that match the per-user filters used by the
+transactions list, dashboard and export endpoints. Safe to re-run: existing
+indexes are skipped.
+
+Indexes added:
+- transactions.idx_user_period_summary (user_id, year, month, type, category, amount)
+  MySQL has no INCLUDE columns, so amount is the last key column; the
+  dashboard's SUM(amount) ... GROUP BY type, category reads only the index.
+- transactions.idx_user_type_category (user_id, type, category)
+- budget_plans.idx_budget_user_period (user_id, year, type, category, month, amount)
+  The dashboard groups a year's budgets by (type, category); uq_user_budget_plan
+  is ordered by month first, so that GROUP BY needed a temporary table.
+
+Indexes dropped:
+- transactions.idx_user_year_month (a prefix of idx_user_period_summary)
+
+Tables whose indexes changed are analyzed afterwards, so the optimizer's key
+distribution statistics cover the new indexes straight away.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from backend.data_pipeline.models import DatabaseManager
+
+# Index name -> (table, columns)
+INDEXES = {
+    "idx_user_period_summary": ("transactions", "user_id, year, month, type, category, amount"),
+    "idx_user_type_category": ("transactions", "user_id, type, category"),
+    "idx_budget_user_period": ("budget_plans", "user_id, year, type, category, month, amount"),
+}
+
+# Index name -> table
+SUPERSEDED_INDEXES = {"idx_user_year_month": "transactions"}
+
+
+def run_migration():
+    """Create the missing query indexes."""
+    print("=" * 60)
+    print("Database Migration: Add Query Indexes")
+    print("=" * 60)
+    print()
+
+    db_manager = DatabaseManager()
+
+    with db_manager.engine.connect() as conn:
+        def index_exists(table: str, name: str) -> bool:
+            return conn.execute(text("""
+                SELECT COUNT(*)
+                FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = :table
+                AND INDEX_NAME = :name
+            """), {"table": table, "name": name}).scalar() > 0
+
+        step = 0
+        changed_tables = set()
+        for name, (table, columns) in INDEXES.items():
+            step += 1
+            print(f"Step {step}: Creating {table}.{name} ({columns})...")
+
+            if index_exists(table, name):
+                print(f"   ℹ️  {name} already exists, skipping")
+                continue
+
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+            changed_tables.add(table)
+            print(f"   ✅ Created {name}")
+
+        for name, table in SUPERSEDED_INDEXES.items():
+            step += 1
+            print(f"Step {step}: Dropping superseded {table}.{name}...")
+
+            if not index_exists(table, name):
+                print(f"   ℹ️  {name} does not exist, skipping")
+                continue
+
+            conn.execute(text(f"DROP INDEX {name} ON {table}"))
+            changed_tables.add(table)
+            print(f"   ✅ Dropped {name}")
+
+        if changed_tables:
+            step += 1
+            tables = ", ".join(sorted(changed_tables))
+            print(f"Step {step}: Analyzing {tables}...")
+            conn.execute(text(f"ANALYZE TABLE {tables}")).all()
+            print("   ✅ Statistics refreshed")
+
+        conn.commit()
+
+    print()
+    print("=" * 60)
+    print("✅ Migration completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    run_migration()
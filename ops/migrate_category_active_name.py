@@ -0,0 +1,94 @@
+"""
+Database Migration: Reusable Names for Archived Categories
+==========================================================
+Soft-deleted categories kept their name reserved, because
+uq_user_category_name (user_id, name) also covered inactive rows. MySQL has no
+partial unique indexes, so uniqueness now applies to a generated column that
+holds the name only while the category is active:
+
+- categories.active_name = CASE WHEN is_active THEN name END (stored)
+- categories.uq_user_active_category_name (user_id, active_name) replaces
+  categories.uq_user_category_name
+
+Safe to re-run: finished steps are skipped.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from backend.data_pipeline.models import DatabaseManager
+
+
+def run_migration():
+    """Move category name uniqueness onto active categories only."""
+    print("=" * 60)
+    print("Database Migration: Reusable Names for Archived Categories")
+    print("=" * 60)
+    print()
+
+    db_manager = DatabaseManager()
+
+    with db_manager.engine.connect() as conn:
+        def column_exists(name: str) -> bool:
+            return conn.execute(text("""
+                SELECT COUNT(*)
+                FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = 'categories'
+                AND COLUMN_NAME = :name
+            """), {"name": name}).scalar() > 0
+
+        def index_exists(name: str) -> bool:
+            return conn.execute(text("""
+                SELECT COUNT(*)
+                FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = 'categories'
+                AND INDEX_NAME = :name
+            """), {"name": name}).scalar() > 0
+
+        print("Step 1: Adding categories.active_name...")
+        if column_exists("active_name"):
+            print("   ℹ️  active_name already exists, skipping")
+        else:
+            conn.execute(text("""
+                ALTER TABLE categories
+                ADD COLUMN active_name VARCHAR(100)
+                GENERATED ALWAYS AS (CASE WHEN is_active THEN name END) STORED
+            """))
+            print("   ✅ Added active_name")
+
+        # Add the new key before dropping the old one so names stay unique throughout
+        print("Step 2: Creating uq_user_active_category_name (user_id, active_name)...")
+        if index_exists("uq_user_active_category_name"):
+            print("   ℹ️  uq_user_active_category_name already exists, skipping")
+        else:
+            conn.execute(text(
+                "CREATE UNIQUE INDEX uq_user_active_category_name ON categories (user_id, active_name)"
+            ))
+            print("   ✅ Created uq_user_active_category_name")
+
+        print("Step 3: Dropping uq_user_category_name (user_id, name)...")
+        if not index_exists("uq_user_category_name"):
+            print("   ℹ️  uq_user_category_name does not exist, skipping")
+        else:
+            conn.execute(text("DROP INDEX uq_user_category_name ON categories"))
+            print("   ✅ Dropped uq_user_category_name")
+
+        conn.commit()
+
+    print()
+    print("=" * 60)
+    print("✅ Migration completed successfully!")
+    print("=" * 60)
+    print()
+    print("Archived categories no longer reserve their names.")
+
+
+if __name__ == "__main__":
+    run_migration()
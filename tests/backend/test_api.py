@@ -100,3 +100,138 @@ def test_auto_populate_monthly_from_yearly():
     # Cleanup
     ids = [b["id"] for b in budgets]
     client.post("/api/budgets/bulk-delete", json=ids)
+
+
+def test_shared_auth_and_database_modules():
+    """Test auth helpers and the database manager have a single canonical definition."""
+    import sys
+    from backend.api import auth, database, dependencies
+    from backend.api.routers import categories, transactions
+
+    assert dependencies.get_current_user is auth.get_current_user
+    assert dependencies.get_admin_user is auth.get_admin_user
+    assert auth.db_manager is database.db_manager
+    assert dependencies.db_manager is database.db_manager
+    assert categories.db_manager is transactions.db_manager is database.db_manager
+    assert not [name for name in sys.modules if name.startswith("api.") or name == "api"]
+
+
+def test_list_responses_only_read_plain_columns():
+    """Test list response fields map to table columns, so serialization never lazy-loads."""
+    from sqlalchemy import inspect
+    from backend.api import schemas
+    from backend.data_pipeline import models
+
+    pairs = [
+        (models.Transaction, schemas.TransactionResponse),
+        (models.BudgetPlan, schemas.BudgetPlanResponse),
+        (models.Category, schemas.CategoryResponse),
+        (models.User, schemas.UserResponse),
+        (models.CategorizationRule, schemas.RuleResponse),
+    ]
+    for model, response in pairs:
+        mapper = inspect(model)
+        assert not mapper.relationships
+        assert set(response.model_fields) <= set(mapper.columns.keys())
+
+
+def test_transaction_stream_route_precedes_id_route():
+    """Test /api/transactions/stream is not captured by the /{transaction_id} route."""
+    paths = [route.path for route in app.routes if "GET" in getattr(route, "methods", ())]
+    assert paths.index("/api/transactions/stream") < paths.index("/api/transactions/{transaction_id}")
+
+
+def test_extractors_read_upload_streams_like_files():
+    """Test an uploaded file's stream parses the same as the file on disk, even mid-read."""
+    import io
+    from pathlib import Path
+    from backend.data_pipeline.config import PipelineConfig
+    from backend.data_pipeline.extractors import CCExtractor
+
+    path = Path(__file__).parents[2] / "dev_reference" / "Samples" / "cc_invoice_aout_sept.csv"
+    stream = io.BytesIO(path.read_bytes())
+    stream.read(10)
+
+    extractor = CCExtractor(PipelineConfig())
+    assert repr(extractor.extract(stream)) == repr(extractor.extract(path))
+
+
+def test_budget_amounts_round_half_cents_as_typed():
+    """Test half-cent floats round up from their typed value, not their binary expansion."""
+    from decimal import Decimal
+    from backend.api.routers.budgets import to_cents
+
+    assert to_cents(2.675) == Decimal("2.68")
+    assert to_cents(10.555) == Decimal("10.56")
+    assert to_cents(Decimal("100.01") / 12) == Decimal("8.33")
+    assert to_cents(Decimal("0.30") / 12) == Decimal("0.03")
+
+
+def test_archived_category_names_can_be_reused():
+    """Test only active categories reserve their name for the user."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import IntegrityError
+    from sqlalchemy.orm import Session
+    from backend.data_pipeline.models import Base, Category
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Category.__table__])
+    with Session(engine) as session:
+        archived = Category(user_id=1, name="Pets", type="Expenses", is_active=False)
+        session.add_all([archived, Category(user_id=1, name="Pets", type="Expenses")])
+        session.commit()
+
+        archived.is_active = True
+        with pytest.raises(IntegrityError):
+            session.commit()
+
+
+def test_summary_keeps_budgeted_categories_whose_actuals_net_to_zero():
+    """Test a budgeted category outside the configured list stays when its transactions cancel out."""
+    from datetime import date
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from backend.api.routers.dashboard import load_dashboard_summary
+    from backend.data_pipeline.models import Base, BudgetPlan, Transaction
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Transaction.__table__, BudgetPlan.__table__])
+    with Session(engine) as session:
+        for amount in (50, -50):
+            session.add(Transaction(
+                user_id=1, date=date(2025, 4, 1), type="Expenses", category="Pet Refunds",
+                amount=amount, description="refund", source="UBS", month=4, year=2025,
+                transaction_hash=f"refund{amount}",
+            ))
+        session.add(BudgetPlan(user_id=1, year=2025, month=None, type="Expenses", category="Pet Refunds", amount=120))
+        session.commit()
+
+        summary = load_dashboard_summary(session, 1, 2025, None)
+
+    assert [(item.category, item.budget, item.actual) for item in summary.expenses] == [("Pet Refunds", 120.0, 0.0)]
+
+
+def test_summary_computed_during_a_write_is_not_served_after_it(monkeypatch):
+    """Test a summary whose query overlapped a write is recomputed on the next request."""
+    from types import SimpleNamespace
+    from backend.api.routers import dashboard
+
+    user = {"id": 987654, "username": "racer", "is_admin": False}
+    loads = []
+
+    def load_during_write(session, user_id, year, month):
+        loads.append(year)
+        if len(loads) == 1:
+            # A write commits and invalidates while this (pre-commit) read runs
+            dashboard.invalidate_dashboard_cache(user_id)
+        body = f'{{"load": {len(loads)}}}'
+        return SimpleNamespace(model_dump_json=lambda: body)
+
+    monkeypatch.setattr(dashboard, "load_dashboard_summary", load_during_write)
+
+    first = dashboard.get_dashboard_summary(2025, None, None, user, None)
+    second = dashboard.get_dashboard_summary(2025, None, None, user, None)
+    third = dashboard.get_dashboard_summary(2025, None, None, user, None)
+
+    assert len(loads) == 2
+    assert first.body != second.body == third.body
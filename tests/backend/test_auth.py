@@ -0,0 +1,115 @@
+"""Unit tests for authentication helpers."""
+
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.api import auth
+from backend.api.cache import TTLCache
+
+
+def test_decode_token_roundtrip():
+    """Test a freshly issued token decodes to its claims."""
+    token = auth.create_access_token({"sub": "alice", "user_id": 1})
+    payload = auth.decode_token(token)
+    assert payload["sub"] == "alice"
+    assert payload["user_id"] == 1
+
+
+def test_decode_token_is_cached():
+    """Test repeated decodes of the same token hit the cache."""
+    auth._token_cache.clear()
+    token = auth.create_access_token({"sub": "bob", "user_id": 2})
+    first = auth.decode_token(token)
+    assert len(auth._token_cache) == 1
+    assert auth.decode_token(token) is first
+
+
+def test_decode_token_rejects_expired():
+    """Test expired tokens are rejected and never cached."""
+    auth._token_cache.clear()
+    token = auth.create_access_token({"sub": "carol", "user_id": 3}, timedelta(seconds=-1))
+    with pytest.raises(HTTPException) as exc:
+        auth.decode_token(token)
+    assert exc.value.status_code == 401
+    assert len(auth._token_cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test the cache stays bounded by evicting the oldest entry."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_pop_where_removes_matching_keys():
+    """Test predicate invalidation drops only the matching entries."""
+    cache = TTLCache(maxsize=8, ttl=60)
+    cache.set((1, 2025, None), "a")
+    cache.set((1, 2025, 3), "b")
+    cache.set((2, 2025, None), "c")
+    assert cache.pop_where(lambda key: key[0] == 1) == 2
+    assert cache.get((1, 2025, 3)) is None
+    assert cache.get((2, 2025, None)) == "c"
+
+
+def test_get_current_user_uses_cached_user_row():
+    """Test a cached user row is used and inactive users are rejected."""
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    token = auth.create_access_token({"sub": "dave", "user_id": 4})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    auth._user_cache.set("dave", {"id": 4, "username": "dave", "is_admin": True, "is_active": True})
+    assert auth.get_current_user(credentials) == {"id": 4, "username": "dave", "is_admin": True}
+
+    auth._user_cache.set("dave", {"id": 4, "username": "dave", "is_admin": False, "is_active": False})
+    with pytest.raises(HTTPException):
+        auth.get_current_user(credentials)
+    auth.invalidate_user_cache("dave")
+
+
+def test_jwt_uses_cryptography_hmac_backend():
+    """Test python-jose signs tokens with the OpenSSL-backed cryptography HMAC key."""
+    from jose import jwk
+
+    assert jwk.get_key(auth.ALGORITHM).__name__ == "CryptographyHMACKey"
+
+
+def test_verify_password_delegates_to_checkpw(monkeypatch):
+    """Test verification always goes through bcrypt's constant-time check."""
+    hashed = auth.get_password_hash("hunter22")
+    calls = []
+    real_checkpw = auth.bcrypt.checkpw
+
+    def spy(password, hashed_password):
+        calls.append(password)
+        return real_checkpw(password, hashed_password)
+
+    monkeypatch.setattr(auth.bcrypt, "checkpw", spy)
+    assert auth.verify_password("hunter22", hashed)
+    # The stored hash itself must never be accepted as the password
+    assert not auth.verify_password(hashed, hashed)
+    assert calls == [b"hunter22", hashed.encode("utf-8")]
+
+
+def test_token_cache_entry_never_outlives_token(monkeypatch):
+    """Test a cached payload is dropped once the token's own exp has passed."""
+    import hashlib
+    from backend.api import cache as cache_module
+
+    auth._token_cache.clear()
+    token = auth.create_access_token({"sub": "erin", "user_id": 5}, timedelta(seconds=5))
+    auth.decode_token(token)
+    key = hashlib.sha256(token.encode()).hexdigest()
+    assert auth._token_cache.get(key) is not None
+
+    now = cache_module.time.monotonic()
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now + 6)
+    assert auth._token_cache.get(key) is None
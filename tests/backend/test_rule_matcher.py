@@ -0,0 +1,60 @@
+"""Unit tests for the compiled categorization rule matcher."""
+
+from backend.data_pipeline.models import CategorizationRule
+from backend.data_pipeline.transformers import RuleMatcher
+
+
+def make_rule(pattern, category, case_sensitive=False, amount_operator=None, amount_value=None):
+    """Build an unsaved rule for matching."""
+    return CategorizationRule(
+        pattern=pattern,
+        case_sensitive=case_sensitive,
+        amount_operator=amount_operator,
+        amount_value=amount_value,
+        type="Expenses",
+        category=category,
+    )
+
+
+def test_first_rule_in_priority_order_wins():
+    """Test the earliest matching rule is returned even if a later one matches first in the text."""
+    matcher = RuleMatcher([make_rule("coop", "Groceries"), make_rule("twint", "Transfers")])
+    assert matcher.match("TWINT payment COOP Lausanne").category == "Groceries"
+    assert matcher.match("twint to friend").category == "Transfers"
+    assert matcher.match("Migros") is None
+
+
+def test_case_sensitivity_and_amount_conditions():
+    """Test per-rule case handling and amount operators fall through to the next rule."""
+    matcher = RuleMatcher([
+        make_rule("Coop", "Big Shop", case_sensitive=True, amount_operator="gt", amount_value=100),
+        make_rule("coop", "Groceries"),
+    ])
+    assert matcher.match("Coop City", 150).category == "Big Shop"
+    assert matcher.match("COOP CITY", 150).category == "Groceries"
+    assert matcher.match("Coop City", 50).category == "Groceries"
+
+
+def test_patterns_are_literal_substrings():
+    """Test regex metacharacters in patterns are matched literally."""
+    matcher = RuleMatcher([make_rule("a.b*", "Literal")])
+    assert matcher.match("xx A.B* yy").category == "Literal"
+    assert matcher.match("aXbb") is None
+
+
+def test_matches_like_a_per_rule_lowercase_loop():
+    """Test the matcher picks the same rule as re-lowercasing per rule, the pre-matcher code."""
+    rules = [make_rule(f"merchant {i}", str(i), case_sensitive=i % 2 == 0) for i in range(50)]
+    descriptions = [f"CARD PAYMENT {i} SOME SHOP LAUSANNE REF {i * 7}" for i in range(500)]
+    descriptions += ["Merchant 3 Zurich", "MERCHANT 4", "merchant 4", "merchant 49 and merchant 2"]
+    matcher = RuleMatcher(rules)
+
+    def per_rule_loop(description):
+        for rule in rules:
+            text = description if rule.case_sensitive else description.lower()
+            pattern = rule.pattern if rule.case_sensitive else rule.pattern.lower()
+            if pattern in text:
+                return rule
+        return None
+
+    assert [matcher.match(d) for d in descriptions] == [per_rule_loop(d) for d in descriptions]